@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from accounts.models import StreamTicket
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding tokens (and their blacklist entries) and "
+        "unused stream tickets in "
+        "small batches so the tables stay small without long locks. Meant to "
+        "run on a schedule, e.g. hourly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches.",
+        )
+
+    def handle(self, *args, **options):
+        now = aware_utcnow()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by(
+            "expires_at"
+        )
+        deleted = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            # BlacklistedToken rows go with them through the cascade
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        self.stdout.write(f"Deleted {deleted} expired tokens")
+        tickets, _ = StreamTicket.objects.filter(expires_at__lte=now).delete()
+        self.stdout.write(f"Deleted {tickets} expired stream tickets")
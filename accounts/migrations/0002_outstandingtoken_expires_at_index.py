@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("token_blacklist", "0013_alter_blacklistedtoken_options_and_more"),
+    ]
+
+    # token_blacklist is a third-party app, so the index used by
+    # prune_tokens is created with raw SQL instead of AddIndex
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS outstandingtoken_expires_at_idx "
+                "ON token_blacklist_outstandingtoken (expires_at)"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS outstandingtoken_expires_at_idx",
+        ),
+    ]
@@ -1,6 +1,12 @@
+import hashlib
 import re
+import secrets
+from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.db import models, transaction
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -14,3 +20,51 @@ class User(AbstractUser):
                     "username": "Username must contain only latin letters, digits, and underscores, min 2 chars, no spaces or special/cyrillic characters."
                 }
             )
+
+
+class StreamTicket(models.Model):
+    """
+    One-time credential for event streams: ``EventSource`` can't send an
+    Authorization header, and a JWT in the URL would end up in access logs.
+    Only the SHA-256 of the ticket is stored.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="stream_tickets",
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    @staticmethod
+    def _hash(ticket):
+        return hashlib.sha256(ticket.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user):
+        ticket = secrets.token_urlsafe(32)
+        cls.objects.create(
+            key=cls._hash(ticket),
+            user=user,
+            expires_at=timezone.now()
+            + timedelta(seconds=settings.STREAM_TICKET_SECONDS),
+        )
+        return ticket
+
+    @classmethod
+    def redeem(cls, ticket):
+        """The active user of an unexpired ``ticket``, which is used up."""
+        with transaction.atomic():
+            stream_ticket = (
+                cls.objects.select_for_update()
+                .select_related("user")
+                .filter(key=cls._hash(ticket))
+                .first()
+            )
+            if stream_ticket is None:
+                return None
+            stream_ticket.delete()
+        if stream_ticket.expires_at <= timezone.now():
+            return None
+        return stream_ticket.user if stream_ticket.user.is_active else None
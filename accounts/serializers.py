@@ -2,6 +2,9 @@ import re
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt import serializers as jwt_serializers
+
+from accounts.tokens import RefreshToken
 
 User = get_user_model()
 
@@ -31,3 +34,11 @@ class UserDetailSerializer(serializers.ModelSerializer):
         model = User
         fields = ["id", "username", "email", "is_staff", "first_name", "last_name"]
         read_only_fields = ["id", "email", "is_staff"]
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
+
+
+class TokenBlacklistSerializer(jwt_serializers.TokenBlacklistSerializer):
+    token_class = RefreshToken
@@ -0,0 +1,46 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+
+class TestCachedJWTAuthentication(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="testpass123")
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_user_loaded_once(self):
+        url = reverse("accounts:user-detail")
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "user")
+
+    def test_update_invalidates_cached_user(self):
+        url = reverse("accounts:user-detail")
+        self.client.get(url)
+        response = self.client.patch(url, {"first_name": "Ivan"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data["first_name"], "Ivan")
+
+    def test_deactivated_user_rejected(self):
+        url = reverse("accounts:user-detail")
+        self.client.get(url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
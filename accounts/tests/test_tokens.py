@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from accounts.models import StreamTicket
+from accounts.tokens import BloomFilter, RefreshToken, blacklist_precheck
+
+User = get_user_model()
+
+
+class TestPruneTokens(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+
+    def create_token(self, jti, expires_in):
+        return OutstandingToken.objects.create(
+            user=self.user,
+            jti=jti,
+            token=jti,
+            created_at=aware_utcnow(),
+            expires_at=aware_utcnow() + expires_in,
+        )
+
+    def test_prune_expired_tokens_in_batches(self):
+        for index in range(5):
+            token = self.create_token(f"expired{index}", timedelta(days=-1))
+            BlacklistedToken.objects.create(token=token)
+        self.create_token("valid", timedelta(days=1))
+        out = StringIO()
+        call_command("prune_tokens", batch_size=2, stdout=out)
+        self.assertIn("Deleted 5", out.getvalue())
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("jti", flat=True)), ["valid"]
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_prune_expired_stream_tickets(self):
+        with override_settings(STREAM_TICKET_SECONDS=-1):
+            StreamTicket.issue(self.user)
+        valid = StreamTicket.issue(self.user)
+        out = StringIO()
+        call_command("prune_tokens", stdout=out)
+        self.assertIn("Deleted 1 expired stream tickets", out.getvalue())
+        self.assertEqual(StreamTicket.redeem(valid), self.user)
+
+
+class TestBlacklistPrecheck(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+
+    def setUp(self):
+        blacklist_precheck.reset()
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(100)
+        bloom.add("a")
+        self.assertIn("a", bloom)
+        self.assertNotIn("b", bloom)
+
+    @override_settings(TOKEN_BLACKLIST_PRECHECK_SECONDS=60)
+    def test_unlisted_token_skips_blacklist_query(self):
+        blacklist_precheck.might_be_blacklisted("warm-up")
+        refresh = str(RefreshToken.for_user(self.user))
+        with self.assertNumQueries(0):
+            RefreshToken(refresh)
+
+    @override_settings(TOKEN_BLACKLIST_PRECHECK_SECONDS=60)
+    def test_rotated_token_rejected(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        url = reverse("accounts:token-refresh")
+        response = self.client.post(url, {"refresh": refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(url, {"refresh": refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
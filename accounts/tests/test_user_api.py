@@ -2,6 +2,9 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from accounts.models import StreamTicket
 
 User = get_user_model()
 
@@ -99,3 +102,46 @@ class TestUserApi(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(User.objects.filter(username="deleteuser").exists())
+
+    def test_update_does_not_revert_changes_from_other_workers(self):
+        user = User.objects.create_user(username="user", password="p")
+        token = self.client.post(
+            reverse("accounts:token-obtain-pair"),
+            {"username": "user", "password": "p"},
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse("accounts:user-detail")
+        self.client.get(url)
+        # queryset updates skip the signals, like a save on another worker
+        User.objects.filter(pk=user.pk).update(is_staff=True)
+
+        response = self.client.patch(url, {"first_name": "Ivan"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(user.first_name, "Ivan")
+        self.assertTrue(user.is_staff)
+
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        response = self.client.patch(url, {"first_name": "Petro"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        user.refresh_from_db()
+        self.assertEqual(user.first_name, "Ivan")
+
+    def test_stream_ticket(self):
+        user = User.objects.create_user(username="user", password="p")
+        url = reverse("accounts:stream-ticket")
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(user)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        ticket = response.data["ticket"]
+        self.assertFalse(StreamTicket.objects.filter(key=ticket).exists())
+        self.assertEqual(StreamTicket.redeem(ticket), user)
+        self.assertIsNone(StreamTicket.redeem(ticket))
+
+    @override_settings(STREAM_TICKET_SECONDS=-1)
+    def test_stream_ticket_expired(self):
+        user = User.objects.create_user(username="user", password="p")
+        self.assertIsNone(StreamTicket.redeem(StreamTicket.issue(user)))
@@ -0,0 +1,100 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class BlacklistPrecheck:
+    """
+    Bloom filter of unexpired blacklisted JTIs, rebuilt from the database
+    every ``TOKEN_BLACKLIST_PRECHECK_SECONDS``. A JTI missing from the filter
+    is not blacklisted, so the database check can be skipped for it.
+
+    Tokens blacklisted by *another* worker only reach this worker's filter on
+    the next rebuild, so a rotated refresh token can be replayed against
+    another worker for up to that interval. That is why it is opt-in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._built_at = 0.0
+
+    @property
+    def interval(self):
+        return getattr(settings, "TOKEN_BLACKLIST_PRECHECK_SECONDS", 0)
+
+    def _rebuild(self):
+        jtis = list(
+            BlacklistedToken.objects.filter(
+                token__expires_at__gt=aware_utcnow()
+            ).values_list("token__jti", flat=True)
+        )
+        bloom = BloomFilter(max(len(jtis) * 2, 1024))
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter, self._built_at = bloom, time.monotonic()
+
+    def might_be_blacklisted(self, jti):
+        with self._lock:
+            if (
+                self._filter is None
+                or time.monotonic() - self._built_at > self.interval
+            ):
+                self._rebuild()
+            return jti in self._filter
+
+    def add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+
+blacklist_precheck = BlacklistPrecheck()
+
+
+class RefreshToken(tokens.RefreshToken):
+    def check_blacklist(self):
+        if blacklist_precheck.interval and not blacklist_precheck.might_be_blacklisted(
+            self.payload[api_settings.JTI_CLAIM]
+        ):
+            return
+        super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_precheck.add(self.payload[api_settings.JTI_CLAIM])
+        return result
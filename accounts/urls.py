@@ -5,13 +5,14 @@ from rest_framework_simplejwt.views import (
     TokenBlacklistView,
 )
 
-from accounts.views import UserCreateView, UserDetailView
+from accounts.views import StreamTicketView, UserCreateView, UserDetailView
 
 app_name = "accounts"
 
 urlpatterns = [
     path("register/", UserCreateView.as_view(), name="register"),
     path("me/", UserDetailView.as_view(), name="user-detail"),
+    path("stream-ticket/", StreamTicketView.as_view(), name="stream-ticket"),
     # jwt
     path("token/", TokenObtainPairView.as_view(), name="token-obtain-pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
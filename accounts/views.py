@@ -1,6 +1,11 @@
 from django.contrib.auth import get_user_model
-from rest_framework import generics, permissions
+from django.shortcuts import get_object_or_404
+from django.conf import settings
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.exceptions import AuthenticationFailed
 
+from accounts.models import StreamTicket
 from accounts.serializers import UserCreateSerializer, UserDetailSerializer
 
 User = get_user_model()
@@ -16,4 +21,26 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+        # the authenticated user may come from a worker's cache; saving it
+        # would write back fields changed since, e.g. by an admin
+        user = get_object_or_404(User, pk=self.request.user.pk)
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+class StreamTicketView(generics.GenericAPIView):
+    """Issue a one-time ticket for opening an event stream as ``?ticket=``."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {
+                "ticket": StreamTicket.issue(request.user),
+                "expires_in": settings.STREAM_TICKET_SECONDS,
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -12,6 +12,9 @@ from airport.models import (
     FlightCrew,
     Ticket,
     Order,
+    FareClass,
+    ArchivedOrder,
+    Cabin,
 )
 
 
@@ -20,9 +23,15 @@ class AirplaneTypeAdmin(admin.ModelAdmin):
     list_display = ["name"]
 
 
+class CabinInline(admin.TabularInline):
+    model = Cabin
+    extra = 0
+
+
 @admin.register(Airplane)
 class AirplaneAdmin(admin.ModelAdmin):
-    list_display = ["name", "rows", "seats_in_row"]
+    list_display = ["name", "rows", "seats_in_row", "capacity"]
+    inlines = [CabinInline]
 
 
 @admin.register(CrewMember)
@@ -60,11 +69,21 @@ class FlightCrewAdmin(admin.ModelAdmin):
     list_display = ["flight", "crew_member", "role"]
 
 
+@admin.register(FareClass)
+class FareClassAdmin(admin.ModelAdmin):
+    list_display = ["code", "name", "multiplier"]
+
+
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
-    list_display = ["row", "seat", "flight"]
+    list_display = ["row", "seat", "flight", "fare_class", "price"]
 
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ["created_at", "user"]
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ["id", "created_at", "user", "archived_at"]
@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+from collections import Counter, defaultdict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch
+
+from airport.models import ArchivedOrder, Flight, FlightCrew, Order, Ticket
+from airport.serializers import TicketDetailSerializer
+
+
+def _records(queryset):
+    label = queryset.model._meta.label_lower
+    for fields in queryset.values().order_by("pk").iterator():
+        yield {"model": label, "fields": fields}
+
+
+def _ticket_snapshots(tickets):
+    """Tickets rendered the way the order detail endpoint shows them."""
+    tickets = tickets.select_related(
+        "fare_class",
+        "flight__route__source__closest_big_city__country",
+        "flight__route__destination__closest_big_city__country",
+        "flight__airplane__airplane_type",
+    ).prefetch_related(
+        Prefetch(
+            "flight__flight_crew",
+            queryset=FlightCrew.objects.select_related("crew_member"),
+        )
+    )
+    snapshots = defaultdict(list)
+    for ticket in tickets.order_by("pk"):
+        snapshots[ticket.order_id].append(TicketDetailSerializer(ticket).data)
+    return snapshots
+
+
+def _archive_orders(snapshots):
+    orders = Order.objects.in_bulk(list(snapshots))
+    existing = ArchivedOrder.objects.in_bulk(list(snapshots))
+    for order_id, tickets in snapshots.items():
+        archived = existing.get(order_id) or ArchivedOrder(
+            id=order_id,
+            created_at=orders[order_id].created_at,
+            user_id=orders[order_id].user_id,
+        )
+        archived.tickets = archived.tickets + tickets
+        archived.save()
+
+
+def archive_flights(before, directory, batch_size=500):
+    """
+    Move flights that departed before ``before`` out of the database, one
+    transaction per ``batch_size`` flights. Each batch is written, with its
+    crew, tickets and the orders of those tickets, to a gzipped NDJSON file
+    in ``directory``. Orders left without tickets are deleted; a snapshot of
+    every archived ticket is kept in ``ArchivedOrder`` for its owner.
+    Returns the number of archived rows per model.
+    """
+    os.makedirs(directory, exist_ok=True)
+    archived = Counter()
+    while True:
+        with transaction.atomic():
+            flight_ids = list(
+                Flight.objects.select_for_update()
+                .filter(departure_time__lt=before)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not flight_ids:
+                break
+            flights = Flight.objects.filter(id__in=flight_ids)
+            crew = FlightCrew.objects.filter(flight_id__in=flight_ids)
+            tickets = Ticket.objects.filter(
+                flight_id__in=flight_ids, departure_time__lt=before
+            )
+            snapshots = _ticket_snapshots(tickets)
+            orders = Order.objects.filter(id__in=list(snapshots))
+
+            path = os.path.join(
+                directory, f"flights-{flight_ids[0]}-{flight_ids[-1]}.ndjson.gz"
+            )
+            try:
+                with gzip.open(f"{path}.tmp", "wt", encoding="utf-8") as archive:
+                    for queryset in (flights, crew, orders, tickets):
+                        for record in _records(queryset):
+                            archive.write(json.dumps(record, cls=DjangoJSONEncoder))
+                            archive.write("\n")
+
+                _archive_orders(snapshots)
+                # raw deletes skip the per-row signals and cascade collection;
+                # nothing outside this batch references these rows
+                archived["tickets"] += tickets._raw_delete(tickets.db)
+                archived["crew"] += crew._raw_delete(crew.db)
+                archived["flights"] += flights._raw_delete(flights.db)
+                empty = orders.filter(tickets__isnull=True)
+                archived["orders"] += empty._raw_delete(empty.db)
+            except BaseException:
+                os.remove(f"{path}.tmp")
+                raise
+        os.replace(f"{path}.tmp", path)
+    return archived
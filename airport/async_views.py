@@ -0,0 +1,246 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.settings import api_settings
+
+from accounts.authentication import CachedJWTAuthentication
+from accounts.models import StreamTicket
+from airport.boards import ARRIVALS, DEPARTURES, get_board
+from airport.events import board_channel, seats_channel
+from airport.filters import FlightFilter, with_available_seats
+from airport.models import Airport, Flight, FlightCrew, Ticket
+from airport.pricing import get_price_table
+from airport.seat_layout import get_layout
+from airport.serializers import FlightListSerializer
+from base.pubsub import RESET, get_broker
+
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+CHUNK_SIZE = 100
+ORDERING_FIELDS = {"departure_time", "arrival_time", "available_seats"}
+
+
+async def _throttle(request):
+    """
+    Count the request against the viewsets' default throttles, so the async
+    endpoints share their fixed-window limits.
+    """
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not await sync_to_async(throttle.allow_request)(request, None):
+            exc = Throttled(throttle.wait())
+            return JsonResponse(
+                {"detail": str(exc.detail)},
+                status=exc.status_code,
+                headers={"Retry-After": str(exc.wait)},
+            )
+    return None
+
+
+async def _authenticate(request):
+    """
+    Resolve the JWT user and apply the throttles the same way the viewsets
+    do; return an error response, or ``None`` when the request may proceed.
+    """
+    try:
+        result = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    except APIException as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+    if result is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    request.user = result[0]
+    return await _throttle(request)
+
+
+def _int_param(request, name, default, maximum=None):
+    try:
+        value = max(int(request.GET.get(name, default)), 0)
+    except ValueError:
+        value = default
+    return min(value, maximum) if maximum else value
+
+
+def _build_search_queryset(request):
+    queryset = with_available_seats(
+        Flight.objects.select_related(
+            "route__source__closest_big_city__country",
+            "route__destination__closest_big_city__country",
+            "airplane__airplane_type",
+        ).prefetch_related(
+            Prefetch(
+                "flight_crew",
+                queryset=FlightCrew.objects.select_related("crew_member"),
+            )
+        )
+    )
+    filterset = FlightFilter(request.GET, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        return None, filterset.errors
+
+    ordering = request.GET.get("ordering", "departure_time")
+    if ordering.lstrip("-") not in ORDERING_FIELDS:
+        ordering = "departure_time"
+    return filterset.qs.order_by(ordering, "id"), None
+
+
+async def flight_search(request):
+    error = await _authenticate(request)
+    if error:
+        return error
+
+    queryset, errors = await sync_to_async(_build_search_queryset)(request)
+    if errors:
+        return JsonResponse(errors, status=status.HTTP_400_BAD_REQUEST)
+
+    limit = _int_param(request, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+    offset = _int_param(request, "offset", 0)
+    count = await queryset.acount()
+    flights = [
+        flight
+        async for flight in queryset[offset : offset + limit].aiterator(
+            chunk_size=CHUNK_SIZE
+        )
+    ]
+    return JsonResponse(
+        {
+            "count": count,
+            "results": FlightListSerializer(flights, many=True).data,
+        }
+    )
+
+
+def _not_found(model):
+    return JsonResponse(
+        {"detail": f"No {model.__name__} matches the given query."},
+        status=status.HTTP_404_NOT_FOUND,
+    )
+
+
+async def _seat_map(flight):
+    taken = [
+        [ticket["row"], ticket["seat"]]
+        async for ticket in Ticket.objects.filter(
+            flight=flight, departure_time=flight.departure_time
+        )
+        .order_by("row", "seat")
+        .values("row", "seat")
+        .aiterator()
+    ]
+    prices = await sync_to_async(get_price_table)(flight.id)
+    layout = await sync_to_async(get_layout)(flight.airplane)
+    return {
+        "flight": flight.id,
+        "rows": layout.rows,
+        "seats_in_row": layout.seats_in_row,
+        "available": layout.capacity - len(taken),
+        "taken": taken,
+        "unavailable": layout.unavailable_seats(),
+        "cabins": [
+            {"fare_class": code, "first_row": first_row, "last_row": last_row}
+            for _, code, first_row, last_row in layout.cabins
+        ],
+        "prices": {code: str(price) for code, price in prices["prices"].items()},
+    }
+
+
+async def flight_seat_map(request, pk):
+    error = await _authenticate(request)
+    if error:
+        return error
+
+    try:
+        flight = await Flight.objects.select_related("airplane").aget(pk=pk)
+    except Flight.DoesNotExist:
+        return _not_found(Flight)
+    return JsonResponse(await _seat_map(flight))
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _event_stream(channel, snapshot):
+    """
+    Subscribe first, then send the snapshot, so no change made in between is
+    lost. A subscriber that falls too far behind gets ``reset`` and the
+    stream ends; ``EventSource`` reconnects and starts from a new snapshot.
+    """
+    subscription = get_broker().subscribe(channel)
+    try:
+        yield _sse("snapshot", await snapshot())
+        while True:
+            try:
+                _, message = await subscription.get(settings.SSE_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message == RESET:
+                yield _sse(RESET, {})
+                return
+            yield _sse(message["event"], message["data"])
+    finally:
+        subscription.close()
+
+
+def _event_response(stream):
+    return StreamingHttpResponse(
+        stream,
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _authenticate_stream(request):
+    # EventSource cannot send headers, so it presents a one-time ticket
+    ticket = request.GET.get("ticket")
+    if not ticket or "HTTP_AUTHORIZATION" in request.META:
+        return await _authenticate(request)
+    user = await sync_to_async(StreamTicket.redeem)(ticket)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Stream ticket is invalid, expired or already used."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    request.user = user
+    return await _throttle(request)
+
+
+async def flight_seat_events(request, pk):
+    error = await _authenticate_stream(request)
+    if error:
+        return error
+
+    try:
+        flight = await Flight.objects.select_related("airplane").aget(pk=pk)
+    except Flight.DoesNotExist:
+        return _not_found(Flight)
+    return _event_response(
+        _event_stream(seats_channel(flight.id), lambda: _seat_map(flight))
+    )
+
+
+async def airport_board_events(request, pk):
+    error = await _authenticate_stream(request)
+    if error:
+        return error
+
+    if not await Airport.objects.filter(pk=pk).aexists():
+        return _not_found(Airport)
+    limit = _int_param(request, "limit", 10, settings.FLIGHT_BOARD_SIZE) or 1
+
+    async def snapshot():
+        return {
+            kind: await sync_to_async(get_board)(pk, kind, limit)
+            for kind in (DEPARTURES, ARRIVALS)
+        }
+
+    return _event_response(_event_stream(board_channel(pk), snapshot))
@@ -0,0 +1,78 @@
+import bisect
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from airport.models import Flight
+from airport.serializers import FlightBoardSerializer
+
+
+DEPARTURES = "departures"
+ARRIVALS = "arrivals"
+
+BOARD_FILTERS = {
+    DEPARTURES: ("route__source_id", "departure_time"),
+    ARRIVALS: ("route__destination_id", "arrival_time"),
+}
+
+
+def board_cache_key(airport_id, kind):
+    return f"flight-board:{kind}:{airport_id}"
+
+
+def get_cached_board(airport_id, kind, limit):
+    """
+    Return the next ``limit`` flights from the cached window, dropping the
+    ones that already left, or ``None`` when the window has to be rebuilt.
+    """
+    board = cache.get(board_cache_key(airport_id, kind))
+    if board is None:
+        return None
+    times, rows = board
+    start = bisect.bisect_left(times, timezone.now().timestamp())
+    if len(times) - start < limit and len(times) >= settings.FLIGHT_BOARD_SIZE:
+        # the window was full, flights past its end may be due now
+        return None
+    return rows[start : start + limit]
+
+
+def build_board(airport_id, kind, limit):
+    airport_field, time_field = BOARD_FILTERS[kind]
+    flights = list(
+        # read from the primary: a replica may not have the save that just
+        # invalidated this board, and the result is cached
+        Flight.objects.using("default")
+        .select_related(
+            "route__source__closest_big_city",
+            "route__destination__closest_big_city",
+            "airplane",
+        )
+        .filter(**{airport_field: airport_id, f"{time_field}__gte": timezone.now()})
+        .order_by(time_field, "id")[: settings.FLIGHT_BOARD_SIZE]
+    )
+    times = [getattr(flight, time_field).timestamp() for flight in flights]
+    rows = FlightBoardSerializer(flights, many=True).data
+    cache.set(
+        board_cache_key(airport_id, kind),
+        (times, rows),
+        settings.FLIGHT_BOARD_CACHE_SECONDS,
+    )
+    return rows[:limit]
+
+
+def get_board(airport_id, kind, limit):
+    rows = get_cached_board(airport_id, kind, limit)
+    if rows is None:
+        rows = build_board(airport_id, kind, limit)
+    return rows
+
+
+def invalidate_boards(*airport_ids):
+    cache.delete_many(
+        [
+            board_cache_key(airport_id, kind)
+            for airport_id in set(airport_ids)
+            for kind in BOARD_FILTERS
+        ]
+    )
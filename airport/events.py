@@ -0,0 +1,29 @@
+from base.pubsub import publish_on_commit
+
+
+def seats_channel(flight_id):
+    return f"flight:{flight_id}:seats"
+
+
+def board_channel(airport_id):
+    return f"airport:{airport_id}:board"
+
+
+def publish_seat(event, flight_id, row, seat):
+    publish_on_commit(
+        seats_channel(flight_id), {"event": event, "data": {"row": row, "seat": seat}}
+    )
+
+
+def publish_flight(event, flight, airport_ids):
+    message = {
+        "event": event,
+        "data": {
+            "flight": flight.pk,
+            "route": flight.route_id,
+            "departure_time": flight.departure_time.isoformat(),
+            "arrival_time": flight.arrival_time.isoformat(),
+        },
+    }
+    for airport_id in set(airport_ids):
+        publish_on_commit(board_channel(airport_id), message)
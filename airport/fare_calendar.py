@@ -0,0 +1,90 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from airport.models import FareClass, Flight
+from airport.pricing import compute_price
+
+
+def _version_key(route_id):
+    return f"route-calendar-version:{route_id}"
+
+
+def invalidate_calendar(route_id):
+    """Bump the route's version so every cached window of it is dropped."""
+    key = _version_key(route_id)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, None)
+
+
+def get_calendar(route, start, days):
+    key = (
+        f"route-calendar:{route.id}:{cache.get(_version_key(route.id), 0)}:"
+        f"{start.isoformat()}:{days}"
+    )
+    calendar = cache.get(key)
+    if calendar is None:
+        calendar = build_calendar(route, start, days)
+        cache.set(key, calendar, settings.ROUTE_CALENDAR_CACHE_SECONDS)
+    return calendar
+
+
+def build_calendar(route, start, days):
+    """
+    Cheapest available fare and free seats per local departure date of the
+    route's source city, from one query that counts sold tickets per flight.
+    """
+    zone = route.source.closest_big_city.timezone
+    first = datetime.combine(start, time.min, tzinfo=zone)
+    flights = (
+        # read from the primary: a replica may lag behind the sale that
+        # invalidated this calendar, and the result is cached until the next
+        Flight.objects.using("default")
+        .filter(
+            route_id=route.id,
+            departure_time__gte=first,
+            departure_time__lt=first + timedelta(days=days),
+        )
+        .annotate(sold=Count("tickets"))
+        .values_list("departure_time", "sold", "airplane__capacity")
+    )
+    multiplier = (
+        FareClass.objects.using("default")
+        .order_by("multiplier")
+        .values_list("multiplier", flat=True)
+        .first()
+    )
+
+    calendar = {
+        start
+        + timedelta(days=offset): {
+            "flights": 0,
+            "available_seats": 0,
+            "min_price": None,
+        }
+        for offset in range(days)
+    }
+    now = timezone.now()
+    for departure_time, sold, capacity in flights:
+        day = calendar[departure_time.astimezone(zone).date()]
+        day["flights"] += 1
+        available = max(capacity - sold, 0)
+        day["available_seats"] += available
+        if not available or multiplier is None:
+            continue
+        price = compute_price(
+            route.distance,
+            sold,
+            capacity,
+            (departure_time - now).total_seconds() / 86400,
+            multiplier,
+        )
+        if day["min_price"] is None or price < day["min_price"]:
+            day["min_price"] = price
+    return [{"date": date, **day} for date, day in calendar.items()]
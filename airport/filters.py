@@ -1,23 +1,117 @@
+from datetime import datetime, time, timedelta
+
 import django_filters as filters
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.models import City, Airport, Route, Flight, Ticket
+
+
+def with_available_seats(queryset):
+    """
+    Annotate ``available_seats``: the airplane's capacity minus the tickets
+    sold, counted by one correlated subquery over the ticket index on
+    ``(flight_id, departure_time)``, which on PostgreSQL also limits it to
+    the flight's ticket partition.
+    """
+    if "available_seats" in queryset.query.annotations:
+        return queryset
+    sold = (
+        Ticket.objects.filter(
+            flight=OuterRef("pk"), departure_time=OuterRef("departure_time")
+        )
+        .order_by()
+        .values("flight")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return queryset.annotate(
+        available_seats=F("airplane__capacity") - Coalesce(Subquery(sold), Value(0))
+    )
+
+
+def city_timezones():
+    """
+    Distinct timezones of all cities. Not cached: a per-process cache would
+    miss the cities other workers add, and the query is a scan of a small
+    table.
+    """
+    return sorted(
+        set(City.objects.values_list("timezone", flat=True).distinct()), key=str
+    )
+
+
+class IdField(forms.IntegerField):
+    """
+    A primary key, only checked to be one rather than fetched the way
+    ``ModelChoiceField`` does; an id without a row simply matches nothing.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("min_value", 1)
+        kwargs.setdefault("max_value", 2**63 - 1)
+        super().__init__(**kwargs)
+
+
+class IdFilter(filters.Filter):
+    """Filters by a foreign key column without loading the row it points to."""
+
+    field_class = IdField
+
+
+class DayFilter(filters.DateFilter):
+    """
+    A calendar day of the current timezone as a half-open range on a
+    datetime column, which can use the column's index where ``__date``
+    can't.
+    """
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        start = timezone.make_aware(datetime.combine(value, time.min))
+        end = timezone.make_aware(datetime.combine(value + timedelta(days=1), time.min))
+        return self.get_method(qs)(
+            **{f"{self.field_name}__gte": start, f"{self.field_name}__lt": end}
+        )
+
+
+class WallClockDateTimeField(forms.DateTimeField):
+    """ISO date or datetime; unlike ``DateTimeField``, naive input stays naive."""
 
-from airport.models import Country, City, Airport, Route, Flight
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, datetime):
+            return value
+        try:
+            result = parse_datetime(value.strip())
+        except ValueError:
+            result = None
+        if result is None:
+            raise ValidationError(self.error_messages["invalid"], code="invalid")
+        return result
+
+
+class WallClockDateTimeFilter(filters.Filter):
+    field_class = WallClockDateTimeField
 
 
 class CityFilter(filters.FilterSet):
+    country = IdFilter(label="Country", field_name="country_id")
+
     class Meta:
         model = City
         fields = ["country"]
 
 
 class AirportFilter(filters.FilterSet):
-    city = filters.ModelChoiceFilter(
-        label="City", field_name="closest_big_city", queryset=City.objects.all()
-    )
-    country = filters.ModelChoiceFilter(
-        label="Country",
-        field_name="closest_big_city__country",
-        queryset=Country.objects.all(),
-    )
+    city = IdFilter(label="City", field_name="closest_big_city_id")
+    country = IdFilter(label="Country", field_name="closest_big_city__country_id")
 
     class Meta:
         model = Airport
@@ -25,33 +119,22 @@ class AirportFilter(filters.FilterSet):
 
 
 class RouteFilter(filters.FilterSet):
-    source_city = filters.ModelChoiceFilter(
-        label="Source city",
-        field_name="source__closest_big_city",
-        queryset=City.objects.all(),
-    )
-    destination_city = filters.ModelChoiceFilter(
-        label="Destination city",
-        field_name="destination__closest_big_city",
-        queryset=City.objects.all(),
-    )
-    source_airport = filters.ModelChoiceFilter(
-        label="Source airport", field_name="source", queryset=Airport.objects.all()
-    )
-    destination_airport = filters.ModelChoiceFilter(
-        label="Destination airport",
-        field_name="destination",
-        queryset=Airport.objects.all(),
-    )
-    source_country = filters.ModelChoiceFilter(
-        label="Source country",
-        field_name="source__closest_big_city__country",
-        queryset=Country.objects.all(),
-    )
-    destination_country = filters.ModelChoiceFilter(
+    source_city = IdFilter(
+        label="Source city", field_name="source__closest_big_city_id"
+    )
+    destination_city = IdFilter(
+        label="Destination city", field_name="destination__closest_big_city_id"
+    )
+    source_airport = IdFilter(label="Source airport", field_name="source_id")
+    destination_airport = IdFilter(
+        label="Destination airport", field_name="destination_id"
+    )
+    source_country = IdFilter(
+        label="Source country", field_name="source__closest_big_city__country_id"
+    )
+    destination_country = IdFilter(
         label="Destination country",
-        field_name="destination__closest_big_city__country",
-        queryset=Country.objects.all(),
+        field_name="destination__closest_big_city__country_id",
     )
 
     class Meta:
@@ -67,37 +150,40 @@ class RouteFilter(filters.FilterSet):
 
 
 class FlightFilter(filters.FilterSet):
-    departure_time = filters.DateFilter(field_name="departure_time", lookup_expr="date")
-    arrival_time = filters.DateFilter(field_name="arrival_time", lookup_expr="date")
-    source_city = filters.ModelChoiceFilter(
-        label="Source city",
-        field_name="route__source__closest_big_city",
-        queryset=City.objects.all(),
-    )
-    destination_city = filters.ModelChoiceFilter(
-        label="Destination city",
-        field_name="route__destination__closest_big_city",
-        queryset=City.objects.all(),
-    )
-    source_airport = filters.ModelChoiceFilter(
-        label="Source airport",
-        field_name="route__source",
-        queryset=Airport.objects.all(),
-    )
-    destination_airport = filters.ModelChoiceFilter(
-        label="Destination airport",
-        field_name="route__destination",
-        queryset=Airport.objects.all(),
-    )
-    source_country = filters.ModelChoiceFilter(
-        label="Source country",
-        field_name="route__source__closest_big_city__country",
-        queryset=Country.objects.all(),
-    )
-    destination_country = filters.ModelChoiceFilter(
+    route = IdFilter(label="Route", field_name="route_id")
+    airplane = IdFilter(label="Airplane", field_name="airplane_id")
+    departure_time = DayFilter(field_name="departure_time")
+    arrival_time = DayFilter(field_name="arrival_time")
+    departure_after = WallClockDateTimeFilter(
+        label="Departs at or after (source city time)", method="filter_departure"
+    )
+    departure_before = WallClockDateTimeFilter(
+        label="Departs before (source city time)", method="filter_departure"
+    )
+    departure_date = filters.DateFilter(
+        label="Departure date (source city time)", method="filter_departure"
+    )
+    source_city = IdFilter(
+        label="Source city", field_name="route__source__closest_big_city_id"
+    )
+    destination_city = IdFilter(
+        label="Destination city", field_name="route__destination__closest_big_city_id"
+    )
+    source_airport = IdFilter(label="Source airport", field_name="route__source_id")
+    destination_airport = IdFilter(
+        label="Destination airport", field_name="route__destination_id"
+    )
+    source_country = IdFilter(
+        label="Source country", field_name="route__source__closest_big_city__country_id"
+    )
+    destination_country = IdFilter(
         label="Destination country",
-        field_name="route__destination__closest_big_city__country",
-        queryset=Country.objects.all(),
+        field_name="route__destination__closest_big_city__country_id",
+    )
+    min_available_seats = filters.NumberFilter(
+        label="Minimum available seats",
+        method="filter_min_available_seats",
+        min_value=0,
     )
 
     class Meta:
@@ -113,4 +199,49 @@ class FlightFilter(filters.FilterSet):
             "destination_city",
             "destination_airport",
             "destination_country",
+            "departure_after",
+            "departure_before",
+            "departure_date",
+            "min_available_seats",
         ]
+
+    def filter_departure(self, queryset, name, value):
+        if name == "departure_date":
+            low = datetime.combine(value, time.min)
+            return self._departing_between(queryset, low, low + timedelta(days=1))
+        # aware datetimes are an exact instant, naive ones are local time
+        if timezone.is_aware(value):
+            lookup = "gte" if name == "departure_after" else "lt"
+            return queryset.filter(**{f"departure_time__{lookup}": value})
+        if name == "departure_after":
+            return self._departing_between(queryset, value, None)
+        return self._departing_between(queryset, None, value)
+
+    def _departing_between(self, queryset, low, high):
+        """
+        Flights departing in ``[low, high)`` of their source city's local
+        time. Each timezone in use becomes one UTC range on
+        ``departure_time``, all within one overall range, so the search is
+        an index range scan instead of a per-row conversion.
+        """
+        condition = Q()
+        starts, ends = [], []
+        for zone in city_timezones():
+            bounds = {}
+            if low is not None:
+                bounds["departure_time__gte"] = low.replace(tzinfo=zone)
+                starts.append(bounds["departure_time__gte"])
+            if high is not None:
+                bounds["departure_time__lt"] = high.replace(tzinfo=zone)
+                ends.append(bounds["departure_time__lt"])
+            condition |= Q(route__source__closest_big_city__timezone=zone, **bounds)
+        if not condition:
+            return queryset.none()
+        if starts:
+            queryset = queryset.filter(departure_time__gte=min(starts))
+        if ends:
+            queryset = queryset.filter(departure_time__lt=max(ends))
+        return queryset.filter(condition)
+
+    def filter_min_available_seats(self, queryset, name, value):
+        return with_available_seats(queryset).filter(available_seats__gte=value)
@@ -0,0 +1,42 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from airport.archive import archive_flights
+
+
+class Command(BaseCommand):
+    help = (
+        "Move flights that departed before a cutoff, with their crew, tickets "
+        "and emptied orders, from the database into gzipped NDJSON files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+            help="Archive flights that departed before this date (YYYY-MM-DD, UTC).",
+        )
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.ARCHIVE_AFTER_DAYS,
+            help="Archive flights that departed more than this many days ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--output", default=settings.ARCHIVE_DIR)
+
+    def handle(self, *args, **options):
+        if options["before"]:
+            before = datetime.combine(
+                options["before"], time.min, tzinfo=timezone.get_fixed_timezone(0)
+            )
+        else:
+            before = timezone.now() - timedelta(days=options["older_than_days"])
+        archived = archive_flights(before, options["output"], options["batch_size"])
+        self.stdout.write(
+            f"Archived {archived['flights']} flights, {archived['tickets']} tickets "
+            f"and {archived['orders']} orders to {options['output']}"
+        )
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+MODES = {
+    "fresh": {"POSTGRES_POOL": "false", "POSTGRES_CONN_MAX_AGE": "0"},
+    "persistent": {"POSTGRES_POOL": "false", "POSTGRES_CONN_MAX_AGE": "600"},
+    "pool": {"POSTGRES_POOL": "true"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare request latency with a fresh connection per request, "
+        "persistent connections (CONN_MAX_AGE) and the psycopg pool. Each mode "
+        "runs in a subprocess with the matching POSTGRES_* environment."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", required=True)
+        parser.add_argument("--path", default="/api/airport/countries/")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options["mode"]:
+            return self._worker(options)
+
+        self.stdout.write(
+            f"{'mode':<12} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"
+        )
+        for mode, env in MODES.items():
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    sys.argv[0],
+                    "bench_db_connections",
+                    "--mode",
+                    mode,
+                    "--username",
+                    options["username"],
+                    "--path",
+                    options["path"],
+                    "--requests",
+                    str(options["requests"]),
+                ],
+                env={**os.environ, **env},
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode:
+                raise CommandError(f"{mode} run failed:\n{result.stderr}")
+            latencies = sorted(json.loads(result.stdout))
+            self.stdout.write(
+                f"{mode:<12} {statistics.mean(latencies):>8.2f} "
+                f"{statistics.median(latencies):>8.2f} "
+                f"{latencies[int(len(latencies) * 0.95) - 1]:>8.2f} "
+                f"{latencies[-1]:>8.2f}"
+            )
+
+    def _worker(self, options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['username']} does not exist")
+        client = Client(
+            headers={"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        )
+        close_old_connections()
+        latencies = []
+        for _ in range(options["requests"]):
+            start = time.perf_counter()
+            # the test client skips the request_started/finished connection
+            # housekeeping, so run it here as the real handler would
+            close_old_connections()
+            response = client.get(options["path"], SERVER_NAME=_host())
+            close_old_connections()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"{options['path']} -> {response.status_code}")
+        self.stdout.write(json.dumps(latencies))
+
+
+def _host():
+    hosts = [host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"]
+    return hosts[0] if hosts else "localhost"
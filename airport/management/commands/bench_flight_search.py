@@ -0,0 +1,159 @@
+import asyncio
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class SlowQueries:
+    """
+    Execute wrapper that holds every query for ``delay`` seconds, like a
+    slow database would, and records the threads the queries ran on.
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.threads = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return execute(sql, params, many, context)
+
+    def install(self, sender, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent requests for one or more paths, e.g. the sync "
+        "/api/airport/flights/ and the async /api/airport/async/flights/, "
+        "through the in-process ASGI handler while every database query is "
+        "slowed down by --query-delay. Reports throughput, latency and how "
+        "many threads ran queries for each path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--query-delay",
+            type=float,
+            default=50,
+            help="Milliseconds every database query is held for.",
+        )
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument("--token", help="JWT access token.")
+        parser.add_argument("--username", help="Mint an access token for this user.")
+
+    def handle(self, *args, **options):
+        token = options["token"]
+        if options["username"]:
+            try:
+                user = get_user_model().objects.get(username=options["username"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['username']} does not exist")
+            token = str(AccessToken.for_user(user))
+        if not token:
+            raise CommandError("Provide --token or --username")
+
+        application = ASGIHandler()
+        self.stdout.write(
+            f"{'path':<50} {'ok':>5} {'err':>5} {'wall s':>8} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'threads':>8}"
+        )
+        for path in options["paths"]:
+            slow = SlowQueries(options["query_delay"] / 1000)
+            connection_created.connect(slow.install)
+            try:
+                latencies, errors, wall = asyncio.run(
+                    self._run(application, path, token, options)
+                )
+            finally:
+                connection_created.disconnect(slow.install)
+            if latencies:
+                latencies.sort()
+                p50 = statistics.median(latencies) * 1000
+                p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000
+            else:
+                p50 = p95 = 0.0
+            self.stdout.write(
+                f"{path:<50} {len(latencies):>5} {errors:>5} {wall:>8.2f} "
+                f"{len(latencies) / wall:>8.1f} {p50:>8.1f} {p95:>8.1f} "
+                f"{len(slow.threads):>8}"
+            )
+
+    async def _run(self, application, path, token, options):
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def limited():
+            async with semaphore:
+                return await self._request(application, path, token, options["host"])
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(limited() for _ in range(options["requests"])),
+            return_exceptions=True,
+        )
+        wall = time.perf_counter() - start
+        latencies = [result for result in results if isinstance(result, float)]
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            self.stderr.write(
+                f"{path}: {len(errors)} failed, first error: {errors[0]!r}"
+            )
+        return latencies, len(errors), wall
+
+    async def _request(self, application, path, token, host):
+        parts = urlsplit(path)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", host.encode()),
+                (b"authorization", f"Bearer {token}".encode()),
+                (b"accept", b"application/json"),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (host, 80),
+        }
+        disconnected = asyncio.Event()
+        requested = False
+        status = None
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        start = time.perf_counter()
+        try:
+            await application(scope, receive, send)
+        finally:
+            disconnected.set()
+        if status != 200:
+            raise RuntimeError(f"{path} returned {status}")
+        return time.perf_counter() - start
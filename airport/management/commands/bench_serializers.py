@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from airport.urls import router
+from base.serializers import clear_compiled_fields
+
+
+def build_tree(serializer):
+    if isinstance(serializer, ListSerializer):
+        return build_tree(serializer.child)
+    for field in serializer.fields.values():
+        if isinstance(field, BaseSerializer):
+            build_tree(field)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time constructing the full serializer field tree for every airport "
+        "viewset action, rebuilt from scratch on each iteration (cold) versus "
+        "cloned from the per-class compiled tree."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        self.stdout.write(
+            f"{'viewset':<24} {'action':<9} {'serializer':<30} "
+            f"{'cold ms':>8} {'compiled ms':>12}"
+        )
+        for _, viewset, _ in router.registry:
+            for action in ["list", "retrieve", "create"]:
+                view = viewset(action=action, request=None, format_kwarg=None)
+                serializer_class = view.get_serializer_class()
+                cold = self._time(serializer_class, iterations, clear=True)
+                compiled = self._time(serializer_class, iterations, clear=False)
+                self.stdout.write(
+                    f"{viewset.__name__:<24} {action:<9} "
+                    f"{serializer_class.__name__:<30} {cold:>8.3f} {compiled:>12.3f}"
+                )
+
+    @staticmethod
+    def _time(serializer_class, iterations, clear):
+        build_tree(serializer_class())
+        elapsed = 0.0
+        for _ in range(iterations):
+            if clear:
+                clear_compiled_fields()
+            start = time.perf_counter()
+            build_tree(serializer_class())
+            elapsed += time.perf_counter() - start
+        return elapsed / iterations * 1000
@@ -0,0 +1,52 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from airport.models import Ticket
+from base.partitioning import create_partitions, detach_partitions, is_partitioned
+
+
+PARTITIONED = [(Ticket._meta.db_table, "departure_time")]
+
+
+def _month(value):
+    try:
+        year, month = value.split("-")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise CommandError(f"Expected YYYY-MM, got {value!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly partitions of the partitioned tables for the "
+        "coming months and optionally detach old ones for archiving. Run it "
+        "at least monthly. Does nothing on databases other than PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=3)
+        parser.add_argument(
+            "--detach-before",
+            type=_month,
+            metavar="YYYY-MM",
+            help="Detach the partitions of the months before this one.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        for table, column in PARTITIONED:
+            if not is_partitioned(connection, table):
+                self.stdout.write(f"{table} is not partitioned, skipping")
+                continue
+            for name in create_partitions(
+                connection, table, column, options["months_ahead"]
+            ):
+                self.stdout.write(f"Created {name}")
+            if options["detach_before"]:
+                for name in detach_partitions(
+                    connection, table, options["detach_before"]
+                ):
+                    self.stdout.write(f"Detached {name}")
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0004_alter_flightcrew_options_remove_order_tickets_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "departure_time"], name="flight_route_departure_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "arrival_time"], name="flight_route_arrival_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("row", "seat", "flight"), name="unique_ticket_per_flight"
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FARE_CLASSES = [
+    ("Y", "Economy", "1.00"),
+    ("W", "Premium Economy", "1.60"),
+    ("J", "Business", "2.80"),
+]
+
+
+def create_fare_classes(apps, schema_editor):
+    FareClass = apps.get_model("airport", "FareClass")
+    FareClass.objects.bulk_create(
+        FareClass(code=code, name=name, multiplier=multiplier)
+        for code, name, multiplier in FARE_CLASSES
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0005_flight_board_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FareClass",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code", models.CharField(max_length=2, unique=True)),
+                ("name", models.CharField(max_length=255)),
+                ("multiplier", models.DecimalField(decimal_places=2, max_digits=5)),
+            ],
+            options={
+                "verbose_name_plural": "fare classes",
+                "ordering": ["multiplier"],
+            },
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="fare_class",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="tickets",
+                to="airport.fareclass",
+            ),
+        ),
+        migrations.RunPython(create_fare_classes, migrations.RunPython.noop),
+    ]
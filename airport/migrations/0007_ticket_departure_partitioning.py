@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+from base.partitioning import partition_table, unpartition_table
+
+
+def copy_departure_time(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    Ticket = apps.get_model("airport", "Ticket")
+    Ticket.objects.update(
+        departure_time=Subquery(
+            Flight.objects.filter(pk=OuterRef("flight_id")).values("departure_time")
+        )
+    )
+
+
+def partition_tickets(apps, schema_editor):
+    partition_table(schema_editor, "airport_ticket", "departure_time")
+
+
+def unpartition_tickets(apps, schema_editor):
+    unpartition_table(schema_editor, "airport_ticket")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_fare_classes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="departure_time",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_departure_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="ticket",
+            name="departure_time",
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.RemoveConstraint(
+            model_name="ticket",
+            name="unique_ticket_per_flight",
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("row", "seat", "flight", "departure_time"),
+                name="unique_ticket_per_flight",
+            ),
+        ),
+        migrations.RunPython(partition_tickets, unpartition_tickets),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+
+POSTGRESQL = [
+    """
+    CREATE FUNCTION airport_ticket_check_bounds() RETURNS trigger AS $$
+    DECLARE
+        max_row integer;
+        max_seat integer;
+    BEGIN
+        SELECT a."rows", a.seats_in_row INTO max_row, max_seat
+        FROM airport_flight f JOIN airport_airplane a ON a.id = f.airplane_id
+        WHERE f.id = NEW.flight_id;
+        IF NEW."row" > max_row THEN
+            RAISE EXCEPTION 'ticket_row_out_of_bounds' USING ERRCODE = 'check_violation';
+        END IF;
+        IF NEW.seat > max_seat THEN
+            RAISE EXCEPTION 'ticket_seat_out_of_bounds' USING ERRCODE = 'check_violation';
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER airport_ticket_check_bounds
+    BEFORE INSERT OR UPDATE OF "row", seat, flight_id ON airport_ticket
+    FOR EACH ROW EXECUTE FUNCTION airport_ticket_check_bounds()
+    """,
+]
+
+POSTGRESQL_REVERSE = [
+    "DROP TRIGGER airport_ticket_check_bounds ON airport_ticket",
+    "DROP FUNCTION airport_ticket_check_bounds()",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0008_archived_orders"),
+    ]
+
+    # PostgreSQL only: other databases rely on Ticket.clean and
+    # TicketSerializer, as SQLite would need its triggers dropped and
+    # recreated around every migration that rebuilds the tables they read
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRESQL}),
+            _run({"postgresql": POSTGRESQL_REVERSE}),
+        ),
+    ]
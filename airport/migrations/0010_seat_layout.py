@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_capacity(apps, schema_editor):
+    Airplane = apps.get_model("airport", "Airplane")
+    Airplane.objects.update(capacity=models.F("rows") * models.F("seats_in_row"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0009_ticket_seat_bounds_triggers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airplane",
+            name="blocked_seats",
+            field=models.BinaryField(blank=True, default=bytes),
+        ),
+        migrations.AddField(
+            model_name="airplane",
+            name="capacity",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="airplane",
+            name="missing_seats",
+            field=models.BinaryField(blank=True, default=bytes),
+        ),
+        migrations.CreateModel(
+            name="Cabin",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("first_row", models.PositiveIntegerField()),
+                ("last_row", models.PositiveIntegerField()),
+                (
+                    "airplane",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cabins",
+                        to="airport.airplane",
+                    ),
+                ),
+                (
+                    "fare_class",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="cabins",
+                        to="airport.fareclass",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["first_row"],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(("first_row__lte", models.F("last_row"))),
+                        name="cabin_rows_ordered",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_capacity, migrations.RunPython.noop),
+    ]
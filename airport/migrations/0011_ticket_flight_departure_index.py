@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0010_seat_layout"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["flight", "departure_time"], name="ticket_flight_departure_idx"
+            ),
+        ),
+    ]
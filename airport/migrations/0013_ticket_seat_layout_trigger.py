@@ -0,0 +1,110 @@
+from django.db import migrations
+
+
+# A seat is not for sale when its bit is set in the airplane's missing or
+# blocked seats: masks packed by base.bitmasks, whose first byte is the
+# number of bytes per row, little-endian, with trailing empty rows trimmed.
+
+POSTGRESQL = [
+    """
+    CREATE FUNCTION airport_seat_flagged(mask bytea, seat_row integer, seat integer)
+    RETURNS boolean AS $$
+    DECLARE
+        width integer;
+        byte_index integer;
+    BEGIN
+        IF seat_row < 1 OR seat < 1 OR length(mask) = 0 THEN
+            RETURN false;
+        END IF;
+        width := get_byte(mask, 0);
+        byte_index := 1 + (seat_row - 1) * width + (seat - 1) / 8;
+        IF (seat - 1) / 8 >= width OR byte_index >= length(mask) THEN
+            RETURN false;
+        END IF;
+        RETURN (get_byte(mask, byte_index) >> mod(seat - 1, 8)) & 1 = 1;
+    END
+    $$ LANGUAGE plpgsql IMMUTABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION airport_ticket_check_bounds() RETURNS trigger AS $$
+    DECLARE
+        max_row integer;
+        max_seat integer;
+        missing bytea;
+        blocked bytea;
+    BEGIN
+        SELECT a."rows", a.seats_in_row, a.missing_seats, a.blocked_seats
+        INTO max_row, max_seat, missing, blocked
+        FROM airport_flight f JOIN airport_airplane a ON a.id = f.airplane_id
+        WHERE f.id = NEW.flight_id;
+        IF NEW."row" > max_row THEN
+            RAISE EXCEPTION 'ticket_row_out_of_bounds' USING ERRCODE = 'check_violation';
+        END IF;
+        IF NEW.seat > max_seat THEN
+            RAISE EXCEPTION 'ticket_seat_out_of_bounds' USING ERRCODE = 'check_violation';
+        END IF;
+        IF airport_seat_flagged(missing, NEW."row", NEW.seat)
+            OR airport_seat_flagged(blocked, NEW."row", NEW.seat) THEN
+            RAISE EXCEPTION 'ticket_seat_not_for_sale' USING ERRCODE = 'check_violation';
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+POSTGRESQL_REVERSE = [
+    """
+    CREATE OR REPLACE FUNCTION airport_ticket_check_bounds() RETURNS trigger AS $$
+    DECLARE
+        max_row integer;
+        max_seat integer;
+    BEGIN
+        SELECT a."rows", a.seats_in_row INTO max_row, max_seat
+        FROM airport_flight f JOIN airport_airplane a ON a.id = f.airplane_id
+        WHERE f.id = NEW.flight_id;
+        IF NEW."row" > max_row THEN
+            RAISE EXCEPTION 'ticket_row_out_of_bounds' USING ERRCODE = 'check_violation';
+        END IF;
+        IF NEW.seat > max_seat THEN
+            RAISE EXCEPTION 'ticket_seat_out_of_bounds' USING ERRCODE = 'check_violation';
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP FUNCTION airport_seat_flagged(bytea, integer, integer)",
+]
+
+# SQLite relies on the checks of TicketSerializer and Ticket.clean instead:
+# its triggers would have to be dropped and recreated around every later
+# migration that rebuilds the airplane, flight or ticket table. Databases
+# migrated when 0009 still created them there lose them here.
+SQLITE = [
+    "DROP TRIGGER IF EXISTS airport_ticket_check_bounds_insert",
+    "DROP TRIGGER IF EXISTS airport_ticket_check_bounds_update",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0012_flight_departure_index"),
+    ]
+
+    # the seat bounds trigger of 0009 also rejects seats that are missing
+    # from the airplane or blocked, on PostgreSQL
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRESQL, "sqlite": SQLITE}),
+            _run({"postgresql": POSTGRESQL_REVERSE}),
+        ),
+    ]
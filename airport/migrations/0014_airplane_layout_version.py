@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0013_ticket_seat_layout_trigger"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airplane",
+            name="layout_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
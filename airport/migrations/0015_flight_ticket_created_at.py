@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:56
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0014_airplane_layout_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="created_at",
+            field=models.DateTimeField(
+                db_default=django.db.models.functions.datetime.Now(), editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="created_at",
+            field=models.DateTimeField(
+                db_default=django.db.models.functions.datetime.Now(), editable=False
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(fields=["created_at", "id"], name="flight_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(fields=["created_at", "id"], name="ticket_created_idx"),
+        ),
+    ]
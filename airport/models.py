@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import IntegrityError, models
 from django.conf import settings
 from timezone_field import TimeZoneField
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.functions import Now
+
+from base import bitmasks
 
 
 class AirplaneType(models.Model):
@@ -18,10 +22,44 @@ class Airplane(models.Model):
     airplane_type = models.ForeignKey(
         AirplaneType, on_delete=models.CASCADE, related_name="airplanes"
     )
+    # seats of the rows x seats_in_row grid that don't exist, and seats that
+    # exist but are not sold; one bitmask per row packed by base.bitmasks
+    missing_seats = models.BinaryField(default=bytes, blank=True)
+    blocked_seats = models.BinaryField(default=bytes, blank=True)
+    # number of sellable seats, kept up to date by save()
+    capacity = models.PositiveIntegerField(default=0, editable=False)
+    # bumped on every change of the seat grid or the cabins; cached seat
+    # layouts are keyed by it so that every worker sees a change at once
+    layout_version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
+    def sellable_masks(self):
+        """Bitmask of the sellable seats of every row, bit 0 being seat 1."""
+        full = (1 << self.seats_in_row) - 1
+        return [
+            full & ~(missing | blocked)
+            for missing, blocked in zip(
+                bitmasks.unpack(self.missing_seats, self.rows),
+                bitmasks.unpack(self.blocked_seats, self.rows),
+            )
+        ]
+
+    def count_capacity(self):
+        return sum(mask.bit_count() for mask in self.sellable_masks())
+
+    def save(self, *args, **kwargs):
+        self.capacity = self.count_capacity()
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        # incremented by the database so that concurrent saves never end up
+        # on the same version
+        self.layout_version = models.F("layout_version") + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["layout_version"])
+
 
 class CrewMember(models.Model):
     first_name = models.CharField(max_length=255)
@@ -93,10 +131,34 @@ class Flight(models.Model):
     )
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    # set by the database, also on bulk and fixture inserts; the analytics
+    # rollup reads flights in this order
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["route", "departure_time"], name="flight_route_departure_idx"
+            ),
+            models.Index(
+                fields=["route", "arrival_time"], name="flight_route_arrival_idx"
+            ),
+            # date searches that don't narrow the route (see airport.filters)
+            models.Index(fields=["departure_time"], name="flight_departure_idx"),
+            models.Index(fields=["created_at", "id"], name="flight_created_idx"),
+        ]
 
     def __str__(self):
         return f"Flight: {self.departure_time} -> {self.arrival_time}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            self.tickets.exclude(departure_time=self.departure_time).update(
+                departure_time=self.departure_time
+            )
+
 
 class FlightCrew(models.Model):
     class CrewRole(models.TextChoices):
@@ -118,6 +180,42 @@ class FlightCrew(models.Model):
         verbose_name_plural = "flight crew"
 
 
+class FareClass(models.Model):
+    code = models.CharField(max_length=2, unique=True)
+    name = models.CharField(max_length=255)
+    multiplier = models.DecimalField(max_digits=5, decimal_places=2)
+
+    class Meta:
+        ordering = ["multiplier"]
+        verbose_name_plural = "fare classes"
+
+    def __str__(self):
+        return f"{self.name} ({self.code})"
+
+
+class Cabin(models.Model):
+    airplane = models.ForeignKey(
+        Airplane, on_delete=models.CASCADE, related_name="cabins"
+    )
+    fare_class = models.ForeignKey(
+        FareClass, on_delete=models.PROTECT, related_name="cabins"
+    )
+    first_row = models.PositiveIntegerField()
+    last_row = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["first_row"]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(first_row__lte=models.F("last_row")),
+                name="cabin_rows_ordered",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.airplane}: rows {self.first_row}-{self.last_row}"
+
+
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -130,13 +228,33 @@ class Ticket(models.Model):
     seat = models.PositiveIntegerField()
     flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name="tickets")
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="tickets")
+    fare_class = models.ForeignKey(
+        FareClass,
+        on_delete=models.PROTECT,
+        related_name="tickets",
+        null=True,
+        blank=True,
+    )
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    # copy of flight.departure_time, the partition key of the ticket table
+    departure_time = models.DateTimeField(editable=False)
+    # see Flight.created_at
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(
-                fields=["row", "seat", "flight"], name="unique_ticket_per_flight"
+                fields=["row", "seat", "flight", "departure_time"],
+                name="unique_ticket_per_flight",
             )
         ]
+        indexes = [
+            # counting a flight's sold seats (see airport.filters)
+            models.Index(
+                fields=["flight", "departure_time"], name="ticket_flight_departure_idx"
+            ),
+            models.Index(fields=["created_at", "id"], name="ticket_created_idx"),
+        ]
 
     def clean(self):
         airplane = self.flight.airplane
@@ -149,9 +267,47 @@ class Ticket(models.Model):
             errors["seat"] = (
                 f"Seat {self.seat} exceeds airplane's max seats in row ({airplane.seats_in_row})"
             )
+        if (
+            not errors
+            and not airplane.sellable_masks()[self.row - 1] >> (self.seat - 1) & 1
+        ):
+            errors["seat"] = f"Seat {self.seat} in row {self.row} is not for sale"
         if errors:
             raise ValidationError(errors)
 
     def save(self, *args, **kwargs):
-        self.clean()
-        super().save(*args, **kwargs)
+        # on PostgreSQL, row and seat bounds and the seat layout are checked
+        # by a database trigger (migrations 0009 and 0013); elsewhere only by
+        # clean() and TicketSerializer
+        self.departure_time = self.flight.departure_time
+        try:
+            super().save(*args, **kwargs)
+        except IntegrityError as error:
+            if "ticket_row_out_of_bounds" in str(error):
+                raise ValidationError(
+                    {"row": f"Row {self.row} exceeds airplane's max rows"}
+                ) from error
+            if "ticket_seat_out_of_bounds" in str(error):
+                raise ValidationError(
+                    {"seat": f"Seat {self.seat} exceeds airplane's max seats in row"}
+                ) from error
+            if "ticket_seat_not_for_sale" in str(error):
+                raise ValidationError(
+                    {"seat": f"Seat {self.seat} in row {self.row} is not for sale"}
+                ) from error
+            raise
+
+
+class ArchivedOrder(models.Model):
+    """Read-only snapshot of the tickets of an order whose flights were archived."""
+
+    # the id of the archived order
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_orders",
+    )
+    archived_at = models.DateTimeField(auto_now=True)
+    tickets = models.JSONField(default=list, encoder=DjangoJSONEncoder)
@@ -0,0 +1,180 @@
+from decimal import ROUND_HALF_UP, Decimal
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from airport.models import FareClass, Flight, Ticket
+
+
+CENT = Decimal("0.01")
+
+
+def _setting(name):
+    return Decimal(str(settings.PRICING[name]))
+
+
+def compute_price(distance, sold, capacity, days_to_departure, multiplier):
+    """
+    Price of one seat: a distance-based fare scaled by the fare class, by
+    how full the flight is and by how close it is to departure.
+    """
+    fare = _setting("BASE_FARE") + distance * _setting("PRICE_PER_KM")
+    load_factor = Decimal(sold) / capacity if capacity else Decimal(1)
+    demand = 1 + _setting("LOAD_FACTOR_WEIGHT") * load_factor**2
+    window = settings.PRICING["LAST_MINUTE_DAYS"]
+    closeness = min(max(1 - Decimal(days_to_departure) / window, 0), 1)
+    urgency = 1 + _setting("LAST_MINUTE_WEIGHT") * closeness
+    return (fare * multiplier * demand * urgency).quantize(CENT, ROUND_HALF_UP)
+
+
+def price_table_key(flight_id):
+    return f"price-table:{flight_id}"
+
+
+def sold_key(flight_id):
+    return f"price-sold:{flight_id}"
+
+
+def _days_to_departure(departure):
+    return (departure - timezone.now()).total_seconds() / 86400
+
+
+def _with_prices(table):
+    days = _days_to_departure(table["departure"])
+    table["prices"] = {
+        code: compute_price(
+            table["distance"], table["sold"], table["capacity"], days, multiplier
+        )
+        for _, code, multiplier in table["fare_classes"]
+    }
+    return table
+
+
+def build_price_table(flight_id):
+    # read from the primary: a replica may lag behind the sales, and the
+    # sold count cached here is only moved by record_sales afterwards
+    flight = (
+        Flight.objects.using("default")
+        .select_related("route", "airplane")
+        .get(pk=flight_id)
+    )
+    table = {
+        "flight": flight.id,
+        "distance": flight.route.distance,
+        "capacity": flight.airplane.capacity,
+        "departure": flight.departure_time,
+        "fare_classes": list(
+            FareClass.objects.using("default").values_list("id", "code", "multiplier")
+        ),
+    }
+    sold = (
+        Ticket.objects.using("default")
+        .filter(flight_id=flight.id, departure_time=flight.departure_time)
+        .count()
+    )
+    cache.set_many(
+        {price_table_key(flight_id): table, sold_key(flight_id): sold},
+        settings.PRICING["TABLE_CACHE_SECONDS"],
+    )
+    return _with_prices({**table, "sold": sold})
+
+
+def get_price_table(flight_id):
+    """
+    Quoted prices of every fare class on a flight. The flight's data is
+    cached once and the seats sold are a separate counter that
+    ``record_sales`` moves atomically, so quoting a whole seat map is one
+    cache lookup. Prices actually charged come from ``OrderPricing``.
+    """
+    cached = cache.get_many([price_table_key(flight_id), sold_key(flight_id)])
+    if len(cached) < 2:
+        return build_price_table(flight_id)
+    return _with_prices(
+        {**cached[price_table_key(flight_id)], "sold": cached[sold_key(flight_id)]}
+    )
+
+
+class OrderPricing:
+    """
+    Prices the tickets of one order, inside its transaction. The flights
+    are locked and their tickets counted in the database once, so
+    concurrent orders and stale cached tables can't skew the charged
+    prices; the order's own tickets are then counted as they are priced.
+    """
+
+    def __init__(self, flight_ids):
+        # cheapest first, by FareClass.Meta.ordering
+        self.fare_classes = list(FareClass.objects.all())
+        # locked in id order, so two orders never wait on each other
+        self.flights = {
+            flight.id: flight
+            for flight in Flight.objects.select_for_update(of=("self",))
+            .select_related("route", "airplane")
+            .filter(pk__in=flight_ids)
+            .order_by("pk")
+        }
+        self.sold = {flight_id: 0 for flight_id in self.flights}
+        if self.flights:
+            self.sold |= dict(
+                Ticket.objects.filter(
+                    reduce(
+                        or_,
+                        (
+                            Q(flight_id=flight.id, departure_time=flight.departure_time)
+                            for flight in self.flights.values()
+                        ),
+                    )
+                )
+                .values("flight_id")
+                .annotate(count=Count("id"))
+                .values_list("flight_id", "count")
+                .order_by()
+            )
+
+    def price(self, flight_id, fare_class_id=None):
+        """
+        Return ``(fare_class_id, price)`` for one more seat on the flight,
+        defaulting to the cheapest fare class, and count it as sold.
+        """
+        fare_class = next(
+            (
+                fare_class
+                for fare_class in self.fare_classes
+                if fare_class_id in (None, fare_class.id)
+            ),
+            None,
+        )
+        if fare_class is None:
+            return None, None
+        flight = self.flights[flight_id]
+        price = compute_price(
+            flight.route.distance,
+            self.sold[flight_id],
+            flight.airplane.capacity,
+            _days_to_departure(flight.departure_time),
+            fare_class.multiplier,
+        )
+        self.sold[flight_id] += 1
+        return fare_class.id, price
+
+
+def record_sales(flight_id, count):
+    try:
+        cache.incr(sold_key(flight_id), count)
+    except ValueError:
+        # not cached; the next build counts the tickets
+        pass
+
+
+def invalidate_price_table(*flight_ids):
+    cache.delete_many(
+        [
+            key
+            for flight_id in flight_ids
+            for key in (price_table_key(flight_id), sold_key(flight_id))
+        ]
+    )
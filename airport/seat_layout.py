@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from airport.models import Airplane, Cabin
+from base import bitmasks
+
+
+class SeatLayout:
+    """
+    Seat grid of an airplane precomputed for O(1) lookups: the sellable
+    seats of every row as a bitmask and the fare class of every row that
+    belongs to a cabin.
+    """
+
+    def __init__(self, airplane, cabins):
+        self.airplane = airplane.id
+        self.rows = airplane.rows
+        self.seats_in_row = airplane.seats_in_row
+        self.capacity = airplane.capacity
+        self.sellable = tuple(airplane.sellable_masks())
+        # (fare_class_id, code, first_row, last_row) per cabin
+        self.cabins = tuple(cabins)
+        row_fare_classes = [None] * self.rows
+        for fare_class_id, _, first_row, last_row in self.cabins:
+            for row in range(first_row, min(last_row, self.rows) + 1):
+                row_fare_classes[row - 1] = fare_class_id
+        self.row_fare_classes = tuple(row_fare_classes)
+
+    def in_bounds(self, row, seat):
+        return 1 <= row <= self.rows and 1 <= seat <= self.seats_in_row
+
+    def is_sellable(self, row, seat):
+        return self.in_bounds(row, seat) and bool(
+            self.sellable[row - 1] >> (seat - 1) & 1
+        )
+
+    def fare_class(self, row):
+        """Id of the fare class of the cabin ``row`` belongs to, if any."""
+        return self.row_fare_classes[row - 1] if 1 <= row <= self.rows else None
+
+    def unavailable_seats(self):
+        """``[row, seat]`` pairs of the grid that can't be sold."""
+        full = (1 << self.seats_in_row) - 1
+        return bitmasks.to_positions(full & ~mask for mask in self.sellable)
+
+
+def seat_layout_key(airplane_id, version):
+    return f"seat-layout:{airplane_id}:{version}"
+
+
+def build_layout(airplane):
+    layout = SeatLayout(
+        airplane,
+        Cabin.objects.filter(airplane_id=airplane.id).values_list(
+            "fare_class_id", "fare_class__code", "first_row", "last_row"
+        ),
+    )
+    cache.set(
+        seat_layout_key(airplane.id, airplane.layout_version),
+        layout,
+        settings.SEAT_LAYOUT_CACHE_SECONDS,
+    )
+    return layout
+
+
+def get_layout(airplane):
+    """
+    Seat layout of ``airplane`` at the layout version it was loaded with;
+    callers pass the row they already have, so a cache hit costs no query.
+    """
+    layout = cache.get(seat_layout_key(airplane.id, airplane.layout_version))
+    if layout is None:
+        layout = build_layout(airplane)
+    return layout
+
+
+def bump_layout_version(airplane_id):
+    Airplane.objects.filter(pk=airplane_id).update(
+        layout_version=F("layout_version") + 1
+    )
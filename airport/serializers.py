@@ -1,10 +1,20 @@
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 
-from base.serializer_fields import TimeZoneSerializerChoicesField
+from base.metrics import ORDERS_CREATED, TICKETS_CREATED, SEAT_CONFLICTS
+from base.serializers import CompiledFieldsMixin, IdentityMapSerializerMixin
+from base import bitmasks
+from base.serializer_fields import (
+    BitmaskPositionsField,
+    LocalDateTimeField,
+    TimeZoneSerializerChoicesField,
+)
 from airport.models import (
     AirplaneType,
     Airplane,
+    Cabin,
+    FareClass,
     Country,
     City,
     Airport,
@@ -14,37 +24,116 @@ from airport.models import (
     FlightCrew,
     Ticket,
     Order,
+    ArchivedOrder,
 )
+from airport.pricing import OrderPricing
+from airport.seat_layout import get_layout
 
 
-class AirplaneTypeSerializer(serializers.ModelSerializer):
+class AirplaneTypeSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AirplaneType
         fields = ["id", "name"]
         read_only_fields = ["id"]
 
 
-class AirplaneSerializer(serializers.ModelSerializer):
-    capacity = serializers.IntegerField(read_only=True)
+class CabinSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
+    fare_class = serializers.SlugRelatedField(
+        slug_field="code", queryset=FareClass.objects.all()
+    )
+
+    class Meta:
+        model = Cabin
+        fields = ["fare_class", "first_row", "last_row"]
+
+
+class AirplaneSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
+    missing_seats = BitmaskPositionsField(required=False)
+    blocked_seats = BitmaskPositionsField(required=False)
+    cabins = CabinSerializer(many=True, required=False)
 
     class Meta:
         model = Airplane
-        fields = ["id", "name", "rows", "seats_in_row", "airplane_type", "capacity"]
+        fields = [
+            "id",
+            "name",
+            "rows",
+            "seats_in_row",
+            "airplane_type",
+            "capacity",
+            "missing_seats",
+            "blocked_seats",
+            "cabins",
+        ]
         read_only_fields = ["id", "capacity"]
 
+    def validate(self, attrs):
+        rows = attrs.get("rows", getattr(self.instance, "rows", None))
+        seats_in_row = attrs.get(
+            "seats_in_row", getattr(self.instance, "seats_in_row", None)
+        )
+        errors = {}
+        for field in ["missing_seats", "blocked_seats"]:
+            for row, seat in bitmasks.to_positions(bitmasks.unpack(attrs.get(field))):
+                if row > rows or seat > seats_in_row:
+                    errors[field] = f"Seat {seat} in row {row} is outside the airplane"
+                    break
+        previous_row = 0
+        for cabin in sorted(attrs.get("cabins", []), key=lambda c: c["first_row"]):
+            if cabin["first_row"] > cabin["last_row"] or cabin["last_row"] > rows:
+                errors["cabins"] = (
+                    f"Rows {cabin['first_row']}-{cabin['last_row']} "
+                    f"are not within the airplane's {rows} rows"
+                )
+            elif cabin["first_row"] <= previous_row:
+                errors["cabins"] = "Cabins must not overlap"
+            previous_row = cabin["last_row"]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data: dict) -> Airplane:
+        with transaction.atomic():
+            cabins = validated_data.pop("cabins", [])
+            airplane = super().create(validated_data)
+            Cabin.objects.bulk_create(
+                Cabin(airplane=airplane, **cabin) for cabin in cabins
+            )
+        return airplane
+
+    def update(self, instance: Airplane, validated_data: dict) -> Airplane:
+        with transaction.atomic():
+            cabins = validated_data.pop("cabins", None)
+            if cabins is not None:
+                instance.cabins.all().delete()
+                Cabin.objects.bulk_create(
+                    Cabin(airplane=instance, **cabin) for cabin in cabins
+                )
+            # saving the airplane last bumps its seat layout version
+            instance = super().update(instance, validated_data)
+        return instance
+
 
 class AirplaneDetailSerializer(AirplaneSerializer):
     airplane_type = AirplaneTypeSerializer(read_only=True)
+    cabins = CabinSerializer(many=True, read_only=True)
+
 
+class FlightAirplaneSerializer(AirplaneDetailSerializer):
+    class Meta:
+        model = Airplane
+        fields = ["id", "name", "rows", "seats_in_row", "airplane_type", "capacity"]
+        read_only_fields = fields
 
-class CountrySerializer(serializers.ModelSerializer):
+
+class CountrySerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Country
         fields = ["id", "name"]
         read_only_fields = ["id"]
 
 
-class CitySerializer(serializers.ModelSerializer):
+class CitySerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     timezone = TimeZoneSerializerChoicesField(use_pytz=False)
 
     class Meta:
@@ -57,7 +146,7 @@ class CityDetailSerializer(CitySerializer):
     country = CountrySerializer(read_only=True)
 
 
-class AirportSerializer(serializers.ModelSerializer):
+class AirportSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Airport
         fields = ["id", "name", "closest_big_city"]
@@ -80,7 +169,7 @@ class AirportDetailSerializer(AirportSerializer):
     closest_big_city = CityDetailSerializer(read_only=True)
 
 
-class RouteSerializer(serializers.ModelSerializer):
+class RouteSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Route
         fields = ["id", "source", "destination", "distance"]
@@ -97,14 +186,33 @@ class RouteDetailSerializer(RouteSerializer):
     destination = AirportDetailSerializer(read_only=True)
 
 
-class CrewMemberSerializer(serializers.ModelSerializer):
+class RouteCalendarQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=1, max_value=90, default=30)
+
+    def get_fields(self):
+        # "from" is a keyword, so it cannot be declared as an attribute
+        fields = super().get_fields()
+        fields["from"] = serializers.DateField(required=False)
+        return fields
+
+
+class RouteCalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    flights = serializers.IntegerField()
+    available_seats = serializers.IntegerField()
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, allow_null=True
+    )
+
+
+class CrewMemberSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CrewMember
         fields = ["id", "first_name", "last_name", "full_name"]
         read_only_fields = ["id", "full_name"]
 
 
-class FlightCrewSerializer(serializers.ModelSerializer):
+class FlightCrewSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = FlightCrew
         fields = ["crew_member", "role"]
@@ -118,7 +226,7 @@ class FlightCrewDetailSerializer(FlightCrewSerializer):
     crew_member = CrewMemberSerializer(read_only=True)
 
 
-class FlightSerializer(serializers.ModelSerializer):
+class FlightSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     flight_crew = FlightCrewSerializer(many=True)
 
     class Meta:
@@ -156,34 +264,128 @@ class FlightSerializer(serializers.ModelSerializer):
         return instance
 
 
-class FlightListSerializer(FlightSerializer):
+class FlightLocalTimesSerializer(FlightSerializer):
+    departure_local = LocalDateTimeField(
+        source="departure_time",
+        timezone_source="route.source.closest_big_city.timezone",
+    )
+    arrival_local = LocalDateTimeField(
+        source="arrival_time",
+        timezone_source="route.destination.closest_big_city.timezone",
+    )
+
+    class Meta:
+        model = Flight
+        fields = [
+            "id",
+            "route",
+            "airplane",
+            "flight_crew",
+            "departure_time",
+            "arrival_time",
+            "departure_local",
+            "arrival_local",
+        ]
+        read_only_fields = ["id"]
+
+
+class FlightBoardSerializer(FlightLocalTimesSerializer):
+    source = serializers.CharField(source="route.source.name", read_only=True)
+    source_city = serializers.CharField(
+        source="route.source.closest_big_city.name", read_only=True
+    )
+    destination = serializers.CharField(source="route.destination.name", read_only=True)
+    destination_city = serializers.CharField(
+        source="route.destination.closest_big_city.name", read_only=True
+    )
+    airplane = serializers.SlugRelatedField(slug_field="name", read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = [
+            "id",
+            "source",
+            "source_city",
+            "destination",
+            "destination_city",
+            "airplane",
+            "departure_time",
+            "arrival_time",
+            "departure_local",
+            "arrival_local",
+        ]
+        read_only_fields = fields
+
+
+class FlightListSerializer(FlightLocalTimesSerializer):
     route = RouteListSerializer(read_only=True)
     airplane = serializers.SlugRelatedField(slug_field="name", read_only=True)
     flight_crew = FlightCrewListSerializer(many=True, read_only=True)
+    # annotated by airport.filters.with_available_seats
+    available_seats = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = [
+            "id",
+            "route",
+            "airplane",
+            "flight_crew",
+            "departure_time",
+            "arrival_time",
+            "departure_local",
+            "arrival_local",
+            "available_seats",
+        ]
+        read_only_fields = fields
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
+    # the airplane carries the version of the cached seat layout
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+    fare_class = serializers.SlugRelatedField(
+        slug_field="code", queryset=FareClass.objects.all(), required=False
+    )
+
     class Meta:
         model = Ticket
-        fields = ["id", "row", "seat", "flight"]
-        read_only_fields = ["id"]
+        fields = ["id", "row", "seat", "flight", "fare_class", "price"]
+        read_only_fields = ["id", "price"]
 
     def validate(self, attrs):
         flight = attrs.get("flight")
         row = attrs.get("row")
         seat = attrs.get("seat")
         errors = {}
-        if flight:
-            airplane = flight.airplane
-            if row and row > airplane.rows:
-                errors["row"] = (
-                    f"Row {row} exceeds airplane's max rows ({airplane.rows})"
-                )
-            if seat and seat > airplane.seats_in_row:
+        # checked against the cached layout without a query; on PostgreSQL a
+        # trigger checks them again on insert (migrations 0009 and 0013)
+        if flight and row and seat:
+            layout = get_layout(flight.airplane)
+            if row > layout.rows:
+                errors["row"] = f"Row {row} exceeds airplane's max rows ({layout.rows})"
+            elif seat > layout.seats_in_row:
                 errors["seat"] = (
-                    f"Seat {seat} exceeds airplane's max seats in row ({airplane.seats_in_row})"
+                    f"Seat {seat} exceeds airplane's max seats in row "
+                    f"({layout.seats_in_row})"
                 )
-            if Ticket.objects.filter(row=row, seat=seat, flight=flight).exists():
+            elif not layout.is_sellable(row, seat):
+                errors["seat"] = f"Seat {seat} in row {row} is not for sale"
+            cabin = layout.fare_class(row)
+            fare_class = attrs.get("fare_class")
+            if fare_class and cabin and fare_class.pk != cabin:
+                errors["fare_class"] = (
+                    f"Row {row} is not in the {fare_class.name} cabin"
+                )
+        if flight:
+            if Ticket.objects.filter(
+                row=row,
+                seat=seat,
+                flight=flight,
+                departure_time=flight.departure_time,
+            ).exists():
+                SEAT_CONFLICTS.inc()
                 errors["non_field_errors"] = [
                     "Duplicate ticket for this flight (row, seat)"
                 ]
@@ -199,9 +401,9 @@ class TicketFlightSerializer(TicketSerializer):
         read_only_fields = ["id"]
 
 
-class FlightDetailSerializer(FlightSerializer):
+class FlightDetailSerializer(FlightLocalTimesSerializer):
     route = RouteDetailSerializer(read_only=True)
-    airplane = AirplaneDetailSerializer(read_only=True)
+    airplane = FlightAirplaneSerializer(read_only=True)
     tickets = TicketFlightSerializer(many=True, read_only=True)
     flight_crew = FlightCrewDetailSerializer(many=True, read_only=True)
 
@@ -214,12 +416,14 @@ class FlightDetailSerializer(FlightSerializer):
             "flight_crew",
             "departure_time",
             "arrival_time",
+            "departure_local",
+            "arrival_local",
             "tickets",
         ]
         read_only_fields = ["id", "route", "airplane", "tickets"]
 
 
-class FlightTicketSerializer(FlightDetailSerializer):
+class FlightTicketSerializer(IdentityMapSerializerMixin, FlightDetailSerializer):
     tickets = None
 
     class Meta:
@@ -231,6 +435,8 @@ class FlightTicketSerializer(FlightDetailSerializer):
             "flight_crew",
             "departure_time",
             "arrival_time",
+            "departure_local",
+            "arrival_local",
         ]
         read_only_fields = ["id", "route", "airplane"]
 
@@ -243,7 +449,7 @@ class TicketDetailSerializer(TicketSerializer):
     flight = FlightTicketSerializer(read_only=True)
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(CompiledFieldsMixin, serializers.ModelSerializer):
     tickets = TicketSerializer(many=True)
 
     class Meta:
@@ -277,15 +483,63 @@ class OrderSerializer(serializers.ModelSerializer):
             tickets = validated_data.pop("tickets", [])
             order = Order.objects.create(user=self._user, **validated_data)
 
-            for ticket in tickets:
-                Ticket.objects.create(order=order, **ticket)
-
+            pricing = OrderPricing({ticket["flight"].id for ticket in tickets})
+
+            for index, ticket in enumerate(tickets):
+                fare_class = ticket.pop("fare_class", None)
+                ticket["fare_class_id"], ticket["price"] = pricing.price(
+                    ticket["flight"].id,
+                    (
+                        fare_class.pk
+                        if fare_class
+                        else get_layout(ticket["flight"].airplane).fare_class(
+                            ticket["row"]
+                        )
+                    ),
+                )
+                try:
+                    Ticket.objects.create(order=order, **ticket)
+                except DjangoValidationError as error:
+                    # errors line up with the tickets, like those of validation
+                    errors = [{} for _ in tickets]
+                    errors[index] = error.message_dict
+                    raise serializers.ValidationError({"tickets": errors}) from error
+
+        ORDERS_CREATED.inc()
+        TICKETS_CREATED.inc(len(tickets))
         return order
 
 
 class OrderListSerializer(OrderSerializer):
-    tickets = TicketListSerializer(many=True, read_only=True)
+    tickets = None
+    ticket_count = serializers.IntegerField(read_only=True)
+    first_departure = serializers.DateTimeField(read_only=True)
+    first_source = serializers.CharField(read_only=True)
+    first_destination = serializers.CharField(read_only=True)
+    total_price = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = Order
+        fields = [
+            "id",
+            "created_at",
+            "ticket_count",
+            "first_departure",
+            "first_source",
+            "first_destination",
+            "total_price",
+        ]
+        read_only_fields = fields
 
 
 class OrderDetailSerializer(OrderSerializer):
     tickets = TicketDetailSerializer(many=True)
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedOrder
+        fields = ["id", "created_at", "archived_at", "tickets"]
+        read_only_fields = fields
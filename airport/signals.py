@@ -0,0 +1,163 @@
+import threading
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from airport.boards import invalidate_boards
+from airport.events import publish_flight, publish_seat
+from airport.fare_calendar import invalidate_calendar
+from airport.models import Airplane, Cabin, Flight, Route, Ticket
+from airport.pricing import invalidate_price_table, record_sales
+from airport.seat_layout import bump_layout_version
+
+
+def _route_airports(route_id):
+    return (
+        Route.objects.filter(pk=route_id)
+        .values_list("source_id", "destination_id")
+        .first()
+        or ()
+    )
+
+
+# flights whose route calendars are dropped when the current transaction
+# commits; kept per thread, like database connections
+_calendar_flights = threading.local()
+
+
+def _flush_calendars():
+    flight_ids = _calendar_flights.__dict__.pop("ids", set())
+    if flight_ids:
+        route_ids = Flight.objects.filter(pk__in=flight_ids).values_list(
+            "route_id", flat=True
+        )
+        for route_id in set(route_ids):
+            invalidate_calendar(route_id)
+
+
+def _invalidate_calendar_on_commit(flight_id):
+    """
+    Drop the calendar of the flight's route after the commit. The routes of
+    all flights queued by a transaction are looked up in one query then, so
+    deleting an order costs the same however many tickets it had. Flights
+    left over by a rolled back transaction are only invalidated again.
+    """
+    _calendar_flights.__dict__.setdefault("ids", set()).add(flight_id)
+    queued = transaction.get_connection().run_on_commit
+    if not any(callback[1] is _flush_calendars for callback in queued):
+        transaction.on_commit(_flush_calendars)
+
+
+@receiver(pre_save, sender=Flight)
+def remember_previous_route(sender, instance, **kwargs):
+    instance._previous_route_id = (
+        Flight.objects.filter(pk=instance.pk).values_list("route_id", flat=True).first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Flight)
+def flight_saved(sender, instance, **kwargs):
+    airports = _route_airports(instance.route_id)
+    previous_route_id = getattr(instance, "_previous_route_id", None)
+    previous_airports = ()
+    if previous_route_id not in (None, instance.route_id):
+        previous_airports = _route_airports(previous_route_id)
+
+    invalidate_boards(*airports, *previous_airports)
+    invalidate_price_table(instance.pk)
+    invalidate_calendar(instance.route_id)
+    if previous_route_id is not None:
+        invalidate_calendar(previous_route_id)
+    publish_flight("flight_changed", instance, airports)
+    publish_flight("flight_removed", instance, set(previous_airports) - set(airports))
+
+
+@receiver(post_delete, sender=Flight)
+def flight_deleted(sender, instance, **kwargs):
+    airports = _route_airports(instance.route_id)
+    invalidate_boards(*airports)
+    invalidate_price_table(instance.pk)
+    invalidate_calendar(instance.route_id)
+    publish_flight("flight_removed", instance, airports)
+
+
+@receiver(pre_save, sender=Route)
+def invalidate_previous_route_boards(sender, instance, **kwargs):
+    if instance.pk:
+        invalidate_boards(*_route_airports(instance.pk))
+
+
+@receiver(post_save, sender=Route)
+def invalidate_route_boards(sender, instance, **kwargs):
+    invalidate_boards(instance.source_id, instance.destination_id)
+
+
+@receiver(pre_save, sender=Airplane)
+def count_capacity(sender, instance, raw=False, **kwargs):
+    # Airplane.save() counts it, but fixtures are saved without calling it
+    if raw:
+        instance.capacity = instance.count_capacity()
+
+
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+def airplane_changed(sender, instance, **kwargs):
+    # prices depend on the capacity
+    invalidate_price_table(
+        *Flight.objects.filter(airplane_id=instance.pk).values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Cabin)
+@receiver(post_delete, sender=Cabin)
+def cabin_changed(sender, instance, **kwargs):
+    bump_layout_version(instance.airplane_id)
+
+
+@receiver(pre_save, sender=Ticket)
+def copy_departure_time(sender, instance, raw=False, **kwargs):
+    # Ticket.save() copies it, but fixtures are saved without calling it
+    if raw and instance.departure_time is None:
+        instance.departure_time = Flight.objects.values_list(
+            "departure_time", flat=True
+        ).get(pk=instance.flight_id)
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_previous_seat(sender, instance, **kwargs):
+    instance._previous_seat = (
+        Ticket.objects.filter(pk=instance.pk)
+        .values_list("flight_id", "row", "seat")
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, **kwargs):
+    seat = (instance.flight_id, instance.row, instance.seat)
+    previous_seat = getattr(instance, "_previous_seat", None)
+    if previous_seat == seat:
+        return
+    if previous_seat is not None:
+        publish_seat("seat_released", *previous_seat)
+    publish_seat("seat_taken", *seat)
+
+    if previous_seat is None or previous_seat[0] != instance.flight_id:
+        transaction.on_commit(partial(record_sales, instance.flight_id, 1))
+        transaction.on_commit(partial(invalidate_calendar, instance.flight.route_id))
+        if previous_seat is not None:
+            transaction.on_commit(partial(record_sales, previous_seat[0], -1))
+            _invalidate_calendar_on_commit(previous_seat[0])
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    publish_seat("seat_released", instance.flight_id, instance.row, instance.seat)
+    transaction.on_commit(partial(record_sales, instance.flight_id, -1))
+    _invalidate_calendar_on_commit(instance.flight_id)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airport.models import Airplane, AirplaneType, Airport, City, Country, Flight, Route
+
+User = get_user_model()
+
+
+class TestAirportBoardApi(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+        country = Country.objects.create(name="Ukraine")
+        kyiv = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kiev"
+        )
+        lviv = City.objects.create(
+            name="Lviv", country=country, is_capital=False, timezone="Europe/Kiev"
+        )
+        cls.boryspil = Airport.objects.create(name="Boryspil", closest_big_city=kyiv)
+        cls.lviv = Airport.objects.create(name="Lviv Airport", closest_big_city=lviv)
+        cls.route = Route.objects.create(
+            source=cls.boryspil, destination=cls.lviv, distance=500
+        )
+        cls.back = Route.objects.create(
+            source=cls.lviv, destination=cls.boryspil, distance=500
+        )
+        airplane_type = AirplaneType.objects.create(name="Boeing 737")
+        cls.airplane = Airplane.objects.create(
+            name="Boeing 737-800", rows=30, seats_in_row=6, airplane_type=airplane_type
+        )
+        now = timezone.now()
+        cls.departed = cls.create_flight(cls.route, now - timedelta(hours=3))
+        cls.flights = [
+            cls.create_flight(cls.route, now + timedelta(hours=hours))
+            for hours in (3, 1, 2)
+        ]
+        cls.create_flight(cls.back, now + timedelta(hours=1))
+
+    @classmethod
+    def create_flight(cls, route, departure):
+        return Flight.objects.create(
+            route=route,
+            airplane=cls.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=1),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def board(self, kind, airport, **params):
+        return self.client.get(
+            reverse(f"airport:airport-{kind}", args=[airport.id]), params
+        )
+
+    def test_departures(self):
+        response = self.board("departures", self.boryspil)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [flight["id"] for flight in response.data],
+            [self.flights[1].id, self.flights[2].id, self.flights[0].id],
+        )
+        self.assertEqual(response.data[0]["destination"], "Lviv Airport")
+        self.assertEqual(response.data[0]["destination_city"], "Lviv")
+
+    def test_arrivals(self):
+        response = self.board("arrivals", self.lviv, limit=2)
+        self.assertEqual(
+            [flight["id"] for flight in response.data],
+            [self.flights[1].id, self.flights[2].id],
+        )
+
+    def test_board_served_from_cache(self):
+        self.board("departures", self.boryspil)
+        with self.assertNumQueries(0):
+            response = self.board("departures", self.boryspil)
+        self.assertEqual(len(response.data), 3)
+
+    def test_flight_save_invalidates_board(self):
+        self.board("departures", self.boryspil)
+        flight = self.create_flight(self.route, timezone.now() + timedelta(minutes=30))
+        response = self.board("departures", self.boryspil)
+        self.assertEqual(response.data[0]["id"], flight.id)
+
+        flight.route = self.back
+        flight.save()
+        response = self.board("departures", self.boryspil)
+        self.assertNotIn(flight.id, [row["id"] for row in response.data])
+
+        flight.delete()
+        response = self.board("departures", self.lviv)
+        self.assertNotIn(flight.id, [row["id"] for row in response.data])
+
+    @override_settings(FLIGHT_BOARD_SIZE=2)
+    def test_full_window_rebuilt_when_exhausted(self):
+        self.board("departures", self.boryspil, limit=2)
+        later = timezone.now() + timedelta(minutes=90)
+        with mock.patch("airport.boards.timezone.now", return_value=later):
+            with self.assertNumQueries(0):
+                response = self.board("departures", self.boryspil, limit=1)
+            self.assertEqual(response.data[0]["id"], self.flights[2].id)
+            response = self.board("departures", self.boryspil, limit=2)
+        self.assertEqual(
+            [flight["id"] for flight in response.data],
+            [self.flights[2].id, self.flights[0].id],
+        )
+
+    def test_unknown_airport(self):
+        response = self.client.get(reverse("airport:airport-departures", args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_anon(self):
+        self.client.force_authenticate(None)
+        response = self.board("departures", self.boryspil)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,166 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airport.archive import archive_flights
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    ArchivedOrder,
+    City,
+    Country,
+    CrewMember,
+    Flight,
+    FlightCrew,
+    Order,
+    Route,
+    Ticket,
+)
+
+
+User = get_user_model()
+
+
+class TestArchiveFlights(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kyiv"
+        )
+        airport = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        route = Route.objects.create(source=airport, destination=airport, distance=0)
+        airplane = Airplane.objects.create(
+            name="Boeing 737-800",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing 737"),
+        )
+        now = timezone.now()
+        cls.old_flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=now - timezone.timedelta(days=400),
+            arrival_time=now - timezone.timedelta(days=400, hours=-2),
+        )
+        cls.new_flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=now + timezone.timedelta(days=1),
+            arrival_time=now + timezone.timedelta(days=1, hours=2),
+        )
+        FlightCrew.objects.create(
+            flight=cls.old_flight,
+            crew_member=CrewMember.objects.create(first_name="Ann", last_name="Lee"),
+            role="captain",
+        )
+        cls.old_order = Order.objects.create(user=cls.user)
+        Ticket.objects.create(row=1, seat=1, flight=cls.old_flight, order=cls.old_order)
+        Ticket.objects.create(row=1, seat=2, flight=cls.old_flight, order=cls.old_order)
+        cls.mixed_order = Order.objects.create(user=cls.user)
+        Ticket.objects.create(
+            row=2, seat=1, flight=cls.old_flight, order=cls.mixed_order
+        )
+        Ticket.objects.create(
+            row=2, seat=1, flight=cls.new_flight, order=cls.mixed_order
+        )
+
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+
+    def archive(self):
+        return archive_flights(
+            timezone.now() - timezone.timedelta(days=365), self.directory, 1
+        )
+
+    def test_archive_moves_departed_flights_to_files(self):
+        archived = self.archive()
+
+        self.assertEqual(archived["flights"], 1)
+        self.assertEqual(archived["tickets"], 3)
+        self.assertEqual(archived["crew"], 1)
+        self.assertEqual(archived["orders"], 1)
+        self.assertFalse(Flight.objects.filter(pk=self.old_flight.pk).exists())
+        self.assertFalse(Order.objects.filter(pk=self.old_order.pk).exists())
+        self.assertEqual(self.mixed_order.tickets.count(), 1)
+
+        (name,) = os.listdir(self.directory)
+        with gzip.open(os.path.join(self.directory, name), "rt") as archive:
+            records = [json.loads(line) for line in archive]
+        self.assertEqual(
+            [record["model"] for record in records],
+            ["airport.flight", "airport.flightcrew"]
+            + ["airport.order"] * 2
+            + ["airport.ticket"] * 3,
+        )
+        self.assertEqual(records[0]["fields"]["id"], self.old_flight.pk)
+
+    def test_archive_keeps_order_snapshots(self):
+        self.archive()
+
+        old_order = ArchivedOrder.objects.get(pk=self.old_order.pk)
+        self.assertEqual(old_order.user, self.user)
+        self.assertEqual(old_order.created_at, self.old_order.created_at)
+        self.assertEqual(
+            [(ticket["row"], ticket["seat"]) for ticket in old_order.tickets],
+            [(1, 1), (1, 2)],
+        )
+        self.assertEqual(
+            old_order.tickets[0]["flight"]["route"]["source"]["name"], "Boryspil"
+        )
+        self.assertEqual(
+            len(ArchivedOrder.objects.get(pk=self.mixed_order.pk).tickets), 1
+        )
+
+    def test_archived_order_served_from_archive(self):
+        self.archive()
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(
+            reverse("airport:order-detail", args=[self.old_order.pk])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.old_order.pk)
+        self.assertEqual(len(response.data["tickets"]), 2)
+
+        response = self.client.get(reverse("airport:order-archived"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_partially_archived_order_merges_archive(self):
+        self.archive()
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(
+            reverse("airport:order-detail", args=[self.mixed_order.pk])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        flights = [ticket["flight"]["id"] for ticket in response.data["tickets"]]
+        self.assertEqual(flights, [self.old_flight.pk, self.new_flight.pk])
+
+    def test_archived_order_of_other_user_not_found(self):
+        self.archive()
+        self.client.force_authenticate(
+            User.objects.create_user(username="other", password="p")
+        )
+        response = self.client.get(
+            reverse("airport:order-detail", args=[self.old_order.pk])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("archive_flights", "--output", self.directory, stdout=out)
+        self.assertIn("Archived 1 flights, 3 tickets and 1 orders", out.getvalue())
+        self.assertEqual(Flight.objects.count(), 1)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from airport.models import Airplane, Ticket
+
+
+class TestFixture(TestCase):
+    def test_loaddata(self):
+        # the orders belong to the superuser created before loading, see README
+        get_user_model().objects.create_superuser(id=1, username="admin", password="p")
+        call_command("loaddata", settings.BASE_DIR / "fixture.json", verbosity=0)
+
+        tickets = Ticket.objects.select_related("flight")
+        self.assertEqual(tickets.count(), 7)
+        for ticket in tickets:
+            self.assertEqual(ticket.departure_time, ticket.flight.departure_time)
+        for airplane in Airplane.objects.all():
+            self.assertEqual(airplane.capacity, airplane.rows * airplane.seats_in_row)
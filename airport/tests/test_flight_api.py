@@ -1,6 +1,10 @@
+from zoneinfo import ZoneInfo
+
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -14,6 +18,8 @@ from airport.models import (
     CrewMember,
     Flight,
     FlightCrew,
+    Order,
+    Ticket,
 )
 
 User = get_user_model()
@@ -80,6 +86,29 @@ class TestFlightApi(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data), 1)
 
+    def test_flight_times_in_city_local_time(self):
+        self.city2.timezone = "America/New_York"
+        self.city2.save()
+        self.authenticate(self.user)
+        response = self.client.get(reverse("airport:flight-list"))
+        flight = response.data[0]
+        self.assertEqual(
+            flight["departure_local"],
+            self.flight.departure_time.astimezone(ZoneInfo("Europe/Kiev")).isoformat(),
+        )
+        self.assertEqual(
+            flight["arrival_local"],
+            self.flight.arrival_time.astimezone(
+                ZoneInfo("America/New_York")
+            ).isoformat(),
+        )
+
+        response = self.client.get(
+            reverse("airport:flight-detail", args=[self.flight.id])
+        )
+        self.assertEqual(response.data["departure_local"], flight["departure_local"])
+        self.assertEqual(response.data["arrival_local"], flight["arrival_local"])
+
     def test_list_flights_anon(self):
         url = reverse("airport:flight-list")
         response = self.client.get(url)
@@ -175,6 +204,16 @@ class TestFlightApi(APITestCase):
         response = self.client.put(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_update_flight_moves_ticket_departure(self):
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(row=1, seat=1, flight=self.flight, order=order)
+        self.assertEqual(ticket.departure_time, self.flight.departure_time)
+
+        self.flight.departure_time += timezone.timedelta(days=40)
+        self.flight.save()
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.departure_time, self.flight.departure_time)
+
     def test_update_flight_user(self):
         self.authenticate(self.user)
         obj = self.flight
@@ -358,3 +397,142 @@ class TestFlightApi(APITestCase):
         for obj in filtered:
             found = any(f["id"] == obj.id for f in response.data)
             self.assertTrue(found)
+
+    def _small_flight(self, sold):
+        airplane = Airplane.objects.create(
+            name="Embraer E175", rows=2, seats_in_row=2, airplane_type=self.type1
+        )
+        flight = Flight.objects.create(
+            route=self.route,
+            airplane=airplane,
+            departure_time=timezone.now() + timezone.timedelta(days=1),
+            arrival_time=timezone.now() + timezone.timedelta(days=1, hours=1),
+        )
+        order = Order.objects.create(user=self.user)
+        for seat in range(1, sold + 1):
+            Ticket.objects.create(row=1, seat=seat, flight=flight, order=order)
+        return flight
+
+    def test_filter_min_available_seats(self):
+        small = self._small_flight(sold=2)
+        self.authenticate(self.user)
+        url = reverse("airport:flight-list")
+
+        response = self.client.get(url, {"min_available_seats": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {f["id"]: f["available_seats"] for f in response.data},
+            {self.flight.id: 180, small.id: 2},
+        )
+
+        response = self.client.get(url, {"min_available_seats": 3})
+        self.assertEqual([f["id"] for f in response.data], [self.flight.id])
+
+        response = self.client.get(url, {"min_available_seats": -1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering_available_seats(self):
+        small = self._small_flight(sold=1)
+        self.authenticate(self.user)
+        url = reverse("airport:flight-list")
+        response = self.client.get(url, {"ordering": "available_seats"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([f["id"] for f in response.data], [small.id, self.flight.id])
+        self.assertEqual(response.data[0]["available_seats"], 3)
+
+    def test_filter_departure_in_source_city_time(self):
+        new_york = City.objects.create(
+            name="New York",
+            country=self.country,
+            is_capital=False,
+            timezone="America/New_York",
+        )
+        jfk = Airport.objects.create(name="JFK", closest_big_city=new_york)
+        utc = ZoneInfo("UTC")
+        # 01:30 on May 2nd in Kyiv
+        kyiv_flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=timezone.datetime(2030, 5, 1, 22, 30, tzinfo=utc),
+            arrival_time=timezone.datetime(2030, 5, 2, 0, 30, tzinfo=utc),
+        )
+        # 22:00 on May 1st in New York
+        new_york_flight = Flight.objects.create(
+            route=Route.objects.create(
+                source=jfk, destination=self.airport1, distance=7500
+            ),
+            airplane=self.airplane,
+            departure_time=timezone.datetime(2030, 5, 2, 2, tzinfo=utc),
+            arrival_time=timezone.datetime(2030, 5, 2, 12, tzinfo=utc),
+        )
+        self.authenticate(self.user)
+        url = reverse("airport:flight-list")
+
+        def ids(**params):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return {f["id"] for f in response.data}
+
+        self.assertEqual(ids(departure_date="2030-05-02"), {kyiv_flight.id})
+        self.assertEqual(ids(departure_date="2030-05-01"), {new_york_flight.id})
+        self.assertEqual(ids(departure_time="2030-05-02"), {new_york_flight.id})
+        self.assertEqual(
+            ids(departure_after="2030-05-01T23:00", departure_before="2030-06-01"),
+            {kyiv_flight.id},
+        )
+        self.assertEqual(
+            ids(departure_after="2030-05-01T23:00Z", departure_before="2030-06-01"),
+            {new_york_flight.id},
+        )
+        self.assertEqual(
+            ids(departure_after="2030-01-01", departure_before="2030-05-02"),
+            {new_york_flight.id},
+        )
+
+        response = self.client.get(url, {"departure_after": "tomorrow"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # a timezone changed without signals, e.g. by another worker
+        City.objects.filter(pk=new_york.pk).update(timezone="Asia/Tokyo")
+        self.assertEqual(
+            ids(departure_date="2030-05-02"), {kyiv_flight.id, new_york_flight.id}
+        )
+
+    def test_id_filters_do_not_load_referenced_rows(self):
+        self.authenticate(self.user)
+        url = reverse("airport:flight-list")
+        params = {
+            "route": self.route.id,
+            "airplane": self.airplane.id,
+            "source_city": self.city1.id,
+            "destination_city": self.city2.id,
+            "source_airport": self.airport1.id,
+            "destination_airport": self.airport2.id,
+            "source_country": self.country.id,
+            "destination_country": self.country.id,
+        }
+        with CaptureQueriesContext(connection) as unfiltered:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as filtered:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([f["id"] for f in response.data], [self.flight.id])
+        self.assertEqual(len(filtered), len(unfiltered))
+
+    def test_id_filters_validate_ids(self):
+        self.authenticate(self.user)
+        url = reverse("airport:flight-list")
+
+        for value in ("abc", "0", "1.5", str(2**63)):
+            response = self.client.get(url, {"source_city": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # like a route or an airplane, an unknown country matches nothing
+        for params in (
+            {"source_country": self.country.id + 100},
+            {"route": self.route.id + 100},
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data, [])
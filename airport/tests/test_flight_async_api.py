@@ -0,0 +1,242 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import StreamTicket
+from airport.models import (
+    Country,
+    City,
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    CrewMember,
+    Flight,
+    FlightCrew,
+    Order,
+    Ticket,
+)
+from base.throttling import get_counter_store
+
+User = get_user_model()
+
+
+class TestFlightAsyncApi(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+        cls.country = Country.objects.create(name="Ukraine")
+        cls.city1 = City.objects.create(
+            name="Kyiv", country=cls.country, is_capital=True, timezone="Europe/Kiev"
+        )
+        cls.city2 = City.objects.create(
+            name="Lviv", country=cls.country, is_capital=False, timezone="Europe/Kiev"
+        )
+        cls.airport1 = Airport.objects.create(
+            name="Boryspil", closest_big_city=cls.city1
+        )
+        cls.airport2 = Airport.objects.create(
+            name="Lviv Airport", closest_big_city=cls.city2
+        )
+        cls.route = Route.objects.create(
+            source=cls.airport1, destination=cls.airport2, distance=500
+        )
+        cls.airplane = Airplane.objects.create(
+            name="Boeing 737-800",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing 737"),
+        )
+        cls.flight = Flight.objects.create(
+            route=cls.route,
+            airplane=cls.airplane,
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timezone.timedelta(hours=2),
+        )
+        FlightCrew.objects.create(
+            flight=cls.flight,
+            crew_member=CrewMember.objects.create(
+                first_name="Ivan", last_name="Ivanov"
+            ),
+            role=FlightCrew.CrewRole.CAPTAIN,
+        )
+        order = Order.objects.create(user=cls.user)
+        Ticket.objects.create(row=2, seat=3, flight=cls.flight, order=order)
+        cls.headers = {"Authorization": f"Bearer {AccessToken.for_user(cls.user)}"}
+
+    async def test_search_flights(self):
+        url = reverse("airport:async-flight-list")
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["results"][0]["id"], self.flight.id)
+        self.assertEqual(
+            data["results"][0]["flight_crew"][0]["crew_member"], "Ivan Ivanov"
+        )
+
+    async def test_search_flights_filtered(self):
+        url = reverse("airport:async-flight-list")
+        response = await self.async_client.get(
+            url, {"source_city": self.city2.id}, headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 0)
+
+    async def test_search_flights_by_available_seats(self):
+        url = reverse("airport:async-flight-list")
+        response = await self.async_client.get(
+            url,
+            {"min_available_seats": 179, "ordering": "-available_seats"},
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["available_seats"], 179)
+        response = await self.async_client.get(
+            url, {"min_available_seats": 180}, headers=self.headers
+        )
+        self.assertEqual(response.json()["count"], 0)
+
+    async def test_search_flights_anon(self):
+        url = reverse("airport:async-flight-list")
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_search_flights_invalid_token(self):
+        url = reverse("airport:async-flight-list")
+        response = await self.async_client.get(
+            url, headers={"Authorization": "Bearer invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_seat_map(self):
+        url = reverse("airport:async-flight-seats", args=[self.flight.id])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["taken"], [[2, 3]])
+        self.assertEqual(data["available"], 30 * 6 - 1)
+
+    async def test_seat_map_not_found(self):
+        url = reverse("airport:async-flight-seats", args=[0])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(
+        THROTTLE_STORE={
+            "BACKEND": "base.throttling.SQLiteCounterStore",
+            "OPTIONS": {"path": ":memory:"},
+        }
+    )
+    async def test_throttled_like_the_viewsets(self):
+        url = reverse("airport:async-flight-list")
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # exhaust the rest of the window (200/minute for users)
+        # in the thread that ran the check: each has its own :memory: database
+        await sync_to_async(
+            lambda: get_counter_store().connection.execute(
+                "UPDATE throttle_counter SET count = 200"
+            )
+        )()
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+        url = reverse("airport:async-airport-board-events", args=[self.airport1.id])
+        ticket = await sync_to_async(StreamTicket.issue)(self.user)
+        response = await self.async_client.get(url, {"ticket": ticket})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def create_ticket(self, row, seat, order):
+        return Ticket.objects.create(
+            row=row, seat=seat, flight=self.flight, order=order
+        )
+
+    def commit(self, change, *args):
+        with self.captureOnCommitCallbacks(execute=True):
+            return change(*args)
+
+    async def read_event(self, stream):
+        event, data = (await anext(stream)).decode().strip().split("\n")
+        return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+    async def test_seat_events(self):
+        url = reverse("airport:async-flight-seat-events", args=[self.flight.id])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        try:
+            event, data = await self.read_event(stream)
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(data["taken"], [[2, 3]])
+
+            order = await Order.objects.acreate(user=self.user)
+            ticket = await sync_to_async(self.commit)(self.create_ticket, 5, 1, order)
+            self.assertEqual(
+                await self.read_event(stream), ("seat_taken", {"row": 5, "seat": 1})
+            )
+            await sync_to_async(self.commit)(ticket.delete)
+            self.assertEqual(
+                await self.read_event(stream),
+                ("seat_released", {"row": 5, "seat": 1}),
+            )
+        finally:
+            await stream.aclose()
+
+    async def test_board_events(self):
+        url = reverse("airport:async-airport-board-events", args=[self.airport1.id])
+        ticket = await sync_to_async(StreamTicket.issue)(self.user)
+        response = await self.async_client.get(url, {"ticket": ticket})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stream = aiter(response.streaming_content)
+        try:
+            event, data = await self.read_event(stream)
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(set(data), {"departures", "arrivals"})
+
+            self.flight.departure_time += timezone.timedelta(minutes=30)
+            await sync_to_async(self.commit)(self.flight.save)
+            event, data = await self.read_event(stream)
+            self.assertEqual(event, "flight_changed")
+            self.assertEqual(data["flight"], self.flight.id)
+            self.assertEqual(
+                data["departure_time"], self.flight.departure_time.isoformat()
+            )
+        finally:
+            await stream.aclose()
+
+    async def test_events_not_found(self):
+        url = reverse("airport:async-airport-board-events", args=[0])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_events_anon(self):
+        url = reverse("airport:async-flight-seat-events", args=[self.flight.id])
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_events_ticket_used_once(self):
+        url = reverse("airport:async-airport-board-events", args=[self.airport1.id])
+        ticket = await sync_to_async(StreamTicket.issue)(self.user)
+        response = await self.async_client.get(url, {"ticket": ticket})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await aiter(response.streaming_content).aclose()
+
+        response = await self.async_client.get(url, {"ticket": ticket})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_events_reject_token_in_url(self):
+        url = reverse("airport:async-airport-board-events", args=[self.airport1.id])
+        response = await self.async_client.get(
+            url, {"token": str(AccessToken.for_user(self.user))}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
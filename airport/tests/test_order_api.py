@@ -1,3 +1,8 @@
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
@@ -57,15 +62,39 @@ class TestOrderApi(APITestCase):
         url = reverse("airport:order-list")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(response.data["count"], 0)
 
     def test_list_orders_user(self):
         self.authenticate(self.user)
         url = reverse("airport:order-list")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.order.id)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], self.order.id)
+
+    def test_list_orders_summary(self):
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=self.order)
+        self.authenticate(self.user)
+        url = reverse("airport:order-list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        order = response.data["results"][0]
+        self.assertNotIn("tickets", order)
+        self.assertEqual(order["ticket_count"], 2)
+        self.assertEqual(order["first_source"], self.airport.name)
+        self.assertEqual(order["first_destination"], self.airport.name)
+        self.assertIsNotNone(order["first_departure"])
+
+    def test_list_orders_paginated(self):
+        for _ in range(3):
+            Order.objects.create(user=self.user)
+        self.authenticate(self.user)
+        url = reverse("airport:order-list")
+        response = self.client.get(url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
 
     def test_list_orders_anon(self):
         url = reverse("airport:order-list")
@@ -79,6 +108,21 @@ class TestOrderApi(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.order.id)
 
+    def test_retrieve_order_shares_flight(self):
+        order = Order.objects.create(user=self.user)
+        for seat in range(1, 7):
+            Ticket.objects.create(row=10, seat=seat, flight=self.flight, order=order)
+        self.authenticate(self.user)
+        url = reverse("airport:order-detail", args=[order.id])
+        # the last query looks for archived tickets of the order
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        flights = [ticket["flight"] for ticket in response.data["tickets"]]
+        self.assertEqual(len(flights), 6)
+        self.assertEqual(flights[0]["id"], self.flight.id)
+        self.assertTrue(all(flight is flights[0] for flight in flights))
+
     def test_retrieve_order_admin(self):
         self.authenticate(self.admin)
         url = reverse("airport:order-detail", args=[self.order.id])
@@ -98,6 +142,39 @@ class TestOrderApi(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(Order.objects.filter(id=response.data["id"]).exists())
 
+    def test_create_order_prices_tickets(self):
+        self.authenticate(self.user)
+        url = reverse("airport:order-list")
+        data = {
+            "tickets": [
+                {"row": 2, "seat": 2, "flight": self.flight.id},
+                {"row": 2, "seat": 3, "flight": self.flight.id, "fare_class": "J"},
+            ]
+        }
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        economy, business = response.data["tickets"]
+        self.assertEqual(economy["fare_class"], "Y")
+        self.assertEqual(business["fare_class"], "J")
+        self.assertGreater(Decimal(business["price"]), Decimal(economy["price"]))
+
+        response = self.client.get(url)
+        self.assertEqual(
+            Decimal(response.data["results"][0]["total_price"]),
+            Decimal(economy["price"]) + Decimal(business["price"]),
+        )
+
+    def test_create_order_unknown_fare_class(self):
+        self.authenticate(self.user)
+        url = reverse("airport:order-list")
+        data = {
+            "tickets": [
+                {"row": 2, "seat": 2, "flight": self.flight.id, "fare_class": "X"}
+            ]
+        }
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_create_order_admin(self):
         self.authenticate(self.admin)
         url = reverse("airport:order-list")
@@ -151,6 +228,44 @@ class TestOrderApi(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("seat", str(response.data))
 
+    def test_create_order_database_error_of_ticket(self):
+        self.authenticate(self.user)
+        url = reverse("airport:order-list")
+        data = {
+            "tickets": [
+                {"row": 2, "seat": 1, "flight": self.flight.id},
+                {"row": 2, "seat": 2, "flight": self.flight.id},
+                {"row": 31, "seat": 1, "flight": self.flight.id},
+            ]
+        }
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["tickets"]
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(errors[:2], [{}, {}])
+        self.assertIn("row", errors[2])
+        self.assertFalse(Ticket.objects.filter(row=2).exists())
+
+    @skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")
+    def test_seat_bounds_checked_by_database(self):
+        with self.assertRaises(ValidationError) as error, transaction.atomic():
+            Ticket.objects.create(row=1, seat=7, flight=self.flight, order=self.order)
+        self.assertIn("seat", error.exception.message_dict)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Ticket.objects.bulk_create(
+                [
+                    Ticket(
+                        row=31,
+                        seat=1,
+                        flight=self.flight,
+                        order=self.order,
+                        departure_time=self.flight.departure_time,
+                    )
+                ]
+            )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Ticket.objects.filter(pk=self.ticket.pk).update(row=31)
+
     def test_create_order_with_duplicate_ticket(self):
         self.authenticate(self.user)
         url = reverse("airport:order-list")
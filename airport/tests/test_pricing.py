@@ -0,0 +1,152 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.pricing import OrderPricing, compute_price, get_price_table
+
+User = get_user_model()
+
+
+class TestComputePrice(SimpleTestCase):
+    def test_distance_and_fare_class(self):
+        self.assertEqual(
+            compute_price(500, 0, 100, 60, Decimal("1.00")), Decimal("70.00")
+        )
+        self.assertEqual(
+            compute_price(500, 0, 100, 60, Decimal("2.00")), Decimal("140.00")
+        )
+        self.assertGreater(
+            compute_price(1000, 0, 100, 60, Decimal(1)),
+            compute_price(500, 0, 100, 60, Decimal(1)),
+        )
+
+    def test_load_factor(self):
+        self.assertEqual(compute_price(500, 50, 100, 60, Decimal(1)), Decimal("87.50"))
+        self.assertEqual(
+            compute_price(500, 100, 100, 60, Decimal(1)), Decimal("140.00")
+        )
+
+    def test_time_to_departure(self):
+        self.assertEqual(compute_price(500, 0, 100, 15, Decimal(1)), Decimal("87.50"))
+        self.assertEqual(compute_price(500, 0, 100, 0, Decimal(1)), Decimal("105.00"))
+        self.assertEqual(compute_price(500, 0, 100, -1, Decimal(1)), Decimal("105.00"))
+
+
+class TestPriceTable(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kiev"
+        )
+        airport = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        cls.route = Route.objects.create(
+            source=airport, destination=airport, distance=500
+        )
+        cls.airplane = Airplane.objects.create(
+            name="Boeing 737-800",
+            rows=10,
+            seats_in_row=10,
+            airplane_type=AirplaneType.objects.create(name="Boeing 737"),
+        )
+        cls.flight = Flight.objects.create(
+            route=cls.route,
+            airplane=cls.airplane,
+            departure_time=timezone.now() + timezone.timedelta(days=60),
+            arrival_time=timezone.now() + timezone.timedelta(days=60, hours=2),
+        )
+        cls.order = Order.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def sell(self, row, seat):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Ticket.objects.create(
+                row=row, seat=seat, flight=self.flight, order=self.order
+            )
+
+    def test_table_cached(self):
+        with self.assertNumQueries(3):
+            table = get_price_table(self.flight.id)
+        self.assertEqual(table["prices"]["Y"], Decimal("70.00"))
+        self.assertEqual(table["prices"]["J"], Decimal("196.00"))
+        with self.assertNumQueries(0):
+            get_price_table(self.flight.id)
+
+    def test_sales_update_table_incrementally(self):
+        get_price_table(self.flight.id)
+        tickets = [self.sell(1, seat) for seat in range(1, 11)]
+        with self.assertNumQueries(0):
+            table = get_price_table(self.flight.id)
+        self.assertEqual(table["sold"], 10)
+        self.assertEqual(table["prices"]["Y"], Decimal("70.70"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tickets[0].delete()
+        self.assertEqual(get_price_table(self.flight.id)["sold"], 9)
+
+    def test_order_pricing_counts_sold_seats_in_database(self):
+        get_price_table(self.flight.id)
+        # sold on another worker: this process's cached counter never moves
+        for seat in range(1, 11):
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.flight, order=self.order
+            )
+        self.assertEqual(get_price_table(self.flight.id)["sold"], 0)
+        with transaction.atomic():
+            pricing = OrderPricing([self.flight.id])
+            fare_class_id, price = pricing.price(self.flight.id)
+            # the order's own tickets count too, without another query
+            with self.assertNumQueries(0):
+                _, next_price = pricing.price(self.flight.id)
+        self.assertEqual(price, Decimal("70.70"))
+        self.assertEqual(next_price, compute_price(500, 11, 100, 60, Decimal(1)))
+        self.assertEqual(
+            get_price_table(self.flight.id)["fare_classes"][0][0], fare_class_id
+        )
+
+    def test_capacity_change_invalidates_table(self):
+        get_price_table(self.flight.id)
+        self.airplane.rows = 20
+        self.airplane.save()
+        self.assertEqual(get_price_table(self.flight.id)["capacity"], 200)
+
+    def test_flight_save_invalidates_table(self):
+        get_price_table(self.flight.id)
+        self.flight.departure_time = timezone.now()
+        self.flight.save()
+        self.assertEqual(
+            get_price_table(self.flight.id)["prices"]["Y"], Decimal("105.00")
+        )
+
+    def test_prices_endpoint(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            reverse("airport:flight-prices", args=[self.flight.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["capacity"], 100)
+        self.assertEqual(response.data["prices"]["Y"], "70.00")
+
+        response = self.client.get(reverse("airport:flight-prices", args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+User = get_user_model()
+KYIV = ZoneInfo("Europe/Kyiv")
+
+
+class TestRouteCalendarApi(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kyiv"
+        )
+        airport = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        cls.route = Route.objects.create(
+            source=airport, destination=airport, distance=500
+        )
+        cls.small = Airplane.objects.create(
+            name="Small",
+            rows=1,
+            seats_in_row=2,
+            airplane_type=AirplaneType.objects.create(name="Boeing 737"),
+        )
+        cls.large = Airplane.objects.create(
+            name="Large",
+            rows=10,
+            seats_in_row=10,
+            airplane_type=cls.small.airplane_type,
+        )
+        cls.start = timezone.localdate(timezone=KYIV) + timedelta(days=60)
+        # 00:30 local time is still the previous day in UTC
+        first = datetime.combine(cls.start, datetime.min.time(), tzinfo=KYIV)
+        cls.early = cls.create_flight(cls.small, first + timedelta(minutes=30))
+        cls.late = cls.create_flight(cls.large, first + timedelta(hours=20))
+        cls.next_day = cls.create_flight(cls.small, first + timedelta(days=1, hours=9))
+        order = Order.objects.create(user=cls.user)
+        for seat in (1, 2):
+            Ticket.objects.create(row=1, seat=seat, flight=cls.next_day, order=order)
+        cls.order = order
+
+    @classmethod
+    def create_flight(cls, airplane, departure):
+        return Flight.objects.create(
+            route=cls.route,
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=1),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def calendar(self, **params):
+        return self.client.get(
+            reverse("airport:route-calendar", args=[self.route.id]),
+            {"from": self.start.isoformat(), **params},
+        )
+
+    def test_calendar(self):
+        response = self.calendar(days=3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
+        first, second, third = response.data
+        self.assertEqual(first["date"], self.start.isoformat())
+        self.assertEqual(first["flights"], 2)
+        self.assertEqual(first["available_seats"], 102)
+        self.assertEqual(first["min_price"], "70.00")
+        self.assertEqual(second["flights"], 1)
+        self.assertEqual(second["available_seats"], 0)
+        self.assertIsNone(second["min_price"])
+        self.assertEqual(third["flights"], 0)
+
+    def test_calendar_cached_until_sale(self):
+        self.calendar(days=3)
+        with self.assertNumQueries(1):
+            self.calendar(days=3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(row=1, seat=1, flight=self.early, order=self.order)
+        response = self.calendar(days=3)
+        self.assertEqual(response.data[0]["available_seats"], 101)
+
+    def test_order_deletion_drops_calendar_once(self):
+        self.calendar(days=3)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.order.delete()
+        # one route lookup for both tickets
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+        response = self.calendar(days=3)
+        self.assertEqual(response.data[1]["available_seats"], 2)
+
+    def test_invalid_params(self):
+        response = self.calendar(days=91)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.calendar(**{"from": "tomorrow"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_defaults_to_today(self):
+        response = self.client.get(
+            reverse("airport:route-calendar", args=[self.route.id])
+        )
+        self.assertEqual(len(response.data), 30)
+        self.assertEqual(
+            response.data[0]["date"], timezone.localdate(timezone=KYIV).isoformat()
+        )
@@ -0,0 +1,266 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Cabin,
+    City,
+    Country,
+    FareClass,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.seat_layout import get_layout
+from base import bitmasks
+
+User = get_user_model()
+
+
+class TestSeatLayout(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="p", is_staff=True
+        )
+        cls.user = User.objects.create_user(username="user", password="p")
+        cls.airplane_type = AirplaneType.objects.create(name="Boeing 737")
+        cls.airplane = Airplane.objects.create(
+            name="Boeing 737-800",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=cls.airplane_type,
+            # row 1 has no seats 3 and 4, seat 10-6 is blocked
+            missing_seats=bitmasks.pack(bitmasks.from_positions([[1, 3], [1, 4]])),
+            blocked_seats=bitmasks.pack(bitmasks.from_positions([[10, 6]])),
+        )
+        cls.business = FareClass.objects.get(code="J")
+        cls.economy = FareClass.objects.get(code="Y")
+        Cabin.objects.create(
+            airplane=cls.airplane, fare_class=cls.business, first_row=1, last_row=2
+        )
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kyiv"
+        )
+        airport = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        cls.flight = Flight.objects.create(
+            route=Route.objects.create(
+                source=airport, destination=airport, distance=500
+            ),
+            airplane=cls.airplane,
+            departure_time=timezone.now() + timezone.timedelta(days=60),
+            arrival_time=timezone.now() + timezone.timedelta(days=60, hours=2),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def layout(self):
+        # the airplane as a new request loads it
+        return get_layout(Airplane.objects.get(pk=self.airplane.id))
+
+    def order(self, **ticket):
+        self.client.force_authenticate(self.user)
+        return self.client.post(
+            reverse("airport:order-list"),
+            {"tickets": [{"flight": self.flight.id, **ticket}]},
+            format="json",
+        )
+
+    def test_layout(self):
+        self.airplane.refresh_from_db()
+        self.assertEqual(self.airplane.capacity, 60 - 2 - 1)
+
+        layout = self.layout()
+        self.assertEqual(layout.capacity, 57)
+        self.assertTrue(layout.is_sellable(1, 2))
+        self.assertFalse(layout.is_sellable(1, 3))
+        self.assertFalse(layout.is_sellable(10, 6))
+        self.assertFalse(layout.is_sellable(11, 1))
+        self.assertEqual(layout.fare_class(2), self.business.id)
+        self.assertIsNone(layout.fare_class(3))
+        self.assertEqual(layout.unavailable_seats(), [[1, 3], [1, 4], [10, 6]])
+
+    def test_layout_cached_until_changed(self):
+        airplane = Airplane.objects.get(pk=self.airplane.id)
+        get_layout(airplane)
+        with self.assertNumQueries(0):
+            get_layout(airplane)
+
+        Cabin.objects.create(
+            airplane=self.airplane, fare_class=self.economy, first_row=3, last_row=10
+        )
+        self.assertEqual(self.layout().fare_class(3), self.economy.id)
+
+        self.airplane.blocked_seats = b""
+        self.airplane.save()
+        self.assertTrue(self.layout().is_sellable(10, 6))
+
+    def test_layout_changed_by_another_worker(self):
+        self.layout()
+        # another worker blocks a seat: this process's cache is not touched
+        Airplane.objects.filter(pk=self.airplane.id).update(
+            blocked_seats=bitmasks.pack(bitmasks.from_positions([[1, 1]])),
+            layout_version=F("layout_version") + 1,
+        )
+        self.assertFalse(self.layout().is_sellable(1, 1))
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        stale = Airplane.objects.get(pk=self.airplane.id)
+        self.airplane.save()
+        stale.save()
+        self.assertEqual(stale.layout_version, self.airplane.layout_version + 1)
+
+    def test_unsellable_seat_rejected(self):
+        response = self.order(row=1, seat=3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("not for sale", str(response.data))
+        self.assertFalse(Ticket.objects.exists())
+
+    @skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")
+    def test_unsellable_seat_checked_by_database(self):
+        wide = Airplane.objects.create(
+            name="Airbus A380",
+            rows=5,
+            seats_in_row=12,
+            airplane_type=self.airplane_type,
+            blocked_seats=bitmasks.pack(bitmasks.from_positions([[2, 11]])),
+        )
+        wide_flight = Flight.objects.create(
+            route=self.flight.route,
+            airplane=wide,
+            departure_time=self.flight.departure_time,
+            arrival_time=self.flight.arrival_time,
+        )
+        order = Order.objects.create(user=self.user)
+        # bypasses the serializer and the cached layout
+        for flight, row, seat in [
+            (self.flight, 1, 3),
+            (self.flight, 1, 4),
+            (self.flight, 10, 6),
+            (wide_flight, 2, 11),
+        ]:
+            with self.assertRaisesMessage(ValidationError, "not for sale"):
+                with transaction.atomic():
+                    Ticket.objects.create(
+                        flight=flight, row=row, seat=seat, order=order
+                    )
+        for flight, row, seat in [
+            (self.flight, 1, 2),
+            (self.flight, 10, 5),
+            (wide_flight, 2, 3),
+            (wide_flight, 2, 12),
+            (wide_flight, 3, 11),
+        ]:
+            Ticket.objects.create(flight=flight, row=row, seat=seat, order=order)
+
+        ticket = Ticket.objects.get(flight=self.flight, row=1, seat=2)
+        ticket.seat = 3
+        with self.assertRaisesMessage(ValidationError, "not for sale"):
+            with transaction.atomic():
+                ticket.save()
+
+    def test_fare_class_follows_cabin(self):
+        response = self.order(row=2, seat=1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.get().fare_class, self.business)
+
+        response = self.order(row=2, seat=2, fare_class="Y")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fare_class", response.data["tickets"][0])
+
+    def test_seat_map(self):
+        response = self.client.get(
+            reverse("airport:async-flight-seats", args=[self.flight.id]),
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["available"], 57)
+        self.assertEqual(data["unavailable"], [[1, 3], [1, 4], [10, 6]])
+        self.assertEqual(
+            data["cabins"], [{"fare_class": "J", "first_row": 1, "last_row": 2}]
+        )
+
+    def test_create_airplane_with_layout(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            reverse("airport:aiplane-list"),
+            {
+                "name": "Airbus A320",
+                "rows": 20,
+                "seats_in_row": 6,
+                "airplane_type": self.airplane_type.id,
+                "missing_seats": [[1, 1], [1, 6]],
+                "blocked_seats": [[20, 1]],
+                "cabins": [
+                    {"fare_class": "J", "first_row": 1, "last_row": 3},
+                    {"fare_class": "Y", "first_row": 4, "last_row": 20},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["capacity"], 117)
+        self.assertEqual(response.data["missing_seats"], [[1, 1], [1, 6]])
+        airplane = Airplane.objects.get(name="Airbus A320")
+        self.assertEqual(airplane.cabins.count(), 2)
+
+        response = self.client.get(
+            reverse("airport:aiplane-detail", args=[airplane.id])
+        )
+        self.assertEqual(response.data["blocked_seats"], [[20, 1]])
+        self.assertEqual(response.data["cabins"][0]["fare_class"], "J")
+
+    def test_invalid_layout_rejected(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            reverse("airport:aiplane-list"),
+            {
+                "name": "Airbus A320",
+                "rows": 20,
+                "seats_in_row": 6,
+                "airplane_type": self.airplane_type.id,
+                "blocked_seats": [[21, 1]],
+                "cabins": [
+                    {"fare_class": "J", "first_row": 1, "last_row": 3},
+                    {"fare_class": "Y", "first_row": 3, "last_row": 20},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"blocked_seats", "cabins"})
+
+    def test_update_airplane_replaces_cabins(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.put(
+            reverse("airport:aiplane-detail", args=[self.airplane.id]),
+            {
+                "name": self.airplane.name,
+                "rows": 10,
+                "seats_in_row": 6,
+                "airplane_type": self.airplane_type.id,
+                "cabins": [{"fare_class": "W", "first_row": 1, "last_row": 10}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.layout().fare_class(5),
+            FareClass.objects.get(code="W").id,
+        )
@@ -1,6 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from airport.async_views import (
+    airport_board_events,
+    flight_search,
+    flight_seat_events,
+    flight_seat_map,
+)
 from airport.views import (
     AirplaneTypeViewSet,
     AirplaneViewSet,
@@ -27,4 +33,18 @@ router.register("crew_members", CrewMemberViewSet, basename="crew-member")
 router.register("flights", FlightViewSet, basename="flight")
 router.register("orders", OrderViewSet, basename="order")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("async/flights/", flight_search, name="async-flight-list"),
+    path("async/flights/<int:pk>/seats/", flight_seat_map, name="async-flight-seats"),
+    path(
+        "async/flights/<int:pk>/seats/events/",
+        flight_seat_events,
+        name="async-flight-seat-events",
+    ),
+    path(
+        "async/airports/<int:pk>/board/events/",
+        airport_board_events,
+        name="async-airport-board-events",
+    ),
+    path("", include(router.urls)),
+]
@@ -1,12 +1,20 @@
+from django.conf import settings
+from django.http import Http404
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework import mixins
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import F, Q, Prefetch
+from django.db.models import Q, Prefetch, Count, Min, OuterRef, Subquery, Sum
 
 from airport.models import (
     AirplaneType,
     Airplane,
+    Cabin,
     CrewMember,
     Country,
     City,
@@ -16,6 +24,7 @@ from airport.models import (
     FlightCrew,
     Ticket,
     Order,
+    ArchivedOrder,
 )
 from airport.serializers import (
     AirplaneTypeSerializer,
@@ -30,22 +39,38 @@ from airport.serializers import (
     RouteSerializer,
     RouteListSerializer,
     RouteDetailSerializer,
+    RouteCalendarDaySerializer,
+    RouteCalendarQuerySerializer,
     CrewMemberSerializer,
     FlightSerializer,
+    FlightBoardSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
     OrderSerializer,
     OrderListSerializer,
     OrderDetailSerializer,
+    ArchivedOrderSerializer,
 )
-from airport.filters import CityFilter, AirportFilter, RouteFilter, FlightFilter
+from airport.boards import ARRIVALS, DEPARTURES, build_board, get_cached_board
+from airport.fare_calendar import get_calendar
+from airport.filters import (
+    CityFilter,
+    AirportFilter,
+    RouteFilter,
+    FlightFilter,
+    with_available_seats,
+)
+from airport.pricing import get_price_table
+from base.db_routers import ReplicaReadMixin
+from base.metrics import MetricsViewSetMixin
+from base.pagination import DefaultPagination
 from base.permissions import (
     IsAdminOrIsAuthenticatedReadOnly,
     IsAdminAllowDeleteOrIsAuthenticatedReadAndCreateOnly,
 )
 
 
-class AirplaneTypeViewSet(ModelViewSet):
+class AirplaneTypeViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = [IsAdminOrIsAuthenticatedReadOnly]
@@ -53,7 +78,7 @@ class AirplaneTypeViewSet(ModelViewSet):
     search_fields = ["name"]
 
 
-class AirplaneViewSet(ModelViewSet):
+class AirplaneViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = Airplane.objects.select_related("airplane_type")
     permission_classes = [IsAdminOrIsAuthenticatedReadOnly]
     filter_backends = [SearchFilter, OrderingFilter]
@@ -61,9 +86,9 @@ class AirplaneViewSet(ModelViewSet):
     ordering_fields = ["capacity"]
 
     def get_queryset(self):
-        return Airplane.objects.annotate(
-            capacity=F("rows") * F("seats_in_row")
-        ).select_related("airplane_type")
+        return Airplane.objects.select_related("airplane_type").prefetch_related(
+            Prefetch("cabins", queryset=Cabin.objects.select_related("fare_class"))
+        )
 
     def get_serializer_class(self):
         if self.action in ["create", "update"]:
@@ -71,7 +96,7 @@ class AirplaneViewSet(ModelViewSet):
         return AirplaneDetailSerializer
 
 
-class CountryViewSet(ModelViewSet):
+class CountryViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     permission_classes = [IsAdminOrIsAuthenticatedReadOnly]
@@ -80,7 +105,7 @@ class CountryViewSet(ModelViewSet):
     ordering_fields = ["name"]
 
 
-class CityViewSet(ModelViewSet):
+class CityViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = City.objects.select_related("country")
     permission_classes = [IsAdminOrIsAuthenticatedReadOnly]
     filter_backends = [SearchFilter, DjangoFilterBackend, OrderingFilter]
@@ -94,7 +119,7 @@ class CityViewSet(ModelViewSet):
         return CityDetailSerializer
 
 
-class AirportViewSet(ModelViewSet):
+class AirportViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = Airport.objects.select_related("closest_big_city__country")
     permission_classes = [IsAdminOrIsAuthenticatedReadOnly]
     filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
@@ -111,10 +136,33 @@ class AirportViewSet(ModelViewSet):
             return AirportListSerializer
         if self.action == "retrieve":
             return AirportDetailSerializer
+        if self.action in ["departures", "arrivals"]:
+            return FlightBoardSerializer
         return AirportSerializer
 
+    @action(detail=True)
+    def departures(self, request, pk=None):
+        return self._board(DEPARTURES)
+
+    @action(detail=True)
+    def arrivals(self, request, pk=None):
+        return self._board(ARRIVALS)
+
+    def _board(self, kind):
+        try:
+            limit = int(self.request.query_params.get("limit", 10))
+        except ValueError:
+            limit = 10
+        limit = min(max(limit, 1), settings.FLIGHT_BOARD_SIZE)
 
-class RouteViewSet(ModelViewSet):
+        rows = get_cached_board(self.kwargs["pk"], kind, limit)
+        if rows is None:
+            airport = self.get_object()
+            rows = build_board(airport.pk, kind, limit)
+        return Response(rows)
+
+
+class RouteViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = Route.objects.select_related(
         "source__closest_big_city__country", "destination__closest_big_city__country"
     )
@@ -144,10 +192,23 @@ class RouteViewSet(ModelViewSet):
             return RouteListSerializer
         if self.action == "retrieve":
             return RouteDetailSerializer
+        if self.action == "calendar":
+            return RouteCalendarDaySerializer
         return RouteSerializer
 
+    @action(detail=True)
+    def calendar(self, request, pk=None):
+        route = self.get_object()
+        params = RouteCalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start = params.validated_data.get("from") or timezone.localdate(
+            timezone=route.source.closest_big_city.timezone
+        )
+        days = get_calendar(route, start, params.validated_data["days"])
+        return Response(self.get_serializer(days, many=True).data)
 
-class CrewMemberViewSet(ModelViewSet):
+
+class CrewMemberViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = CrewMember.objects.all()
     serializer_class = CrewMemberSerializer
     permission_classes = [IsAdminOrIsAuthenticatedReadOnly]
@@ -156,7 +217,7 @@ class CrewMemberViewSet(ModelViewSet):
     ordering_fields = ["first_name", "last_name"]
 
 
-class FlightViewSet(ModelViewSet):
+class FlightViewSet(MetricsViewSetMixin, ReplicaReadMixin, ModelViewSet):
     permission_classes = [IsAdminOrIsAuthenticatedReadOnly]
     filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
     search_fields = [
@@ -169,11 +230,11 @@ class FlightViewSet(ModelViewSet):
         "airplane__name",
         "airplane__airplane_type__name",
     ]
-    ordering_fields = ["departure_time", "arrival_time"]
+    ordering_fields = ["departure_time", "arrival_time", "available_seats"]
     filterset_class = FlightFilter
 
     def get_queryset(self):
-        return Flight.objects.select_related(
+        queryset = Flight.objects.select_related(
             "route__source__closest_big_city__country",
             "route__destination__closest_big_city__country",
             "airplane__airplane_type",
@@ -183,6 +244,9 @@ class FlightViewSet(ModelViewSet):
             ),
             "tickets",
         )
+        if self.action == "list":
+            return with_available_seats(queryset)
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -191,8 +255,25 @@ class FlightViewSet(ModelViewSet):
             return FlightDetailSerializer
         return FlightSerializer
 
+    @action(detail=True)
+    def prices(self, request, pk=None):
+        try:
+            table = get_price_table(pk)
+        except (Flight.DoesNotExist, ValueError):
+            raise NotFound
+        return Response(
+            {
+                "flight": table["flight"],
+                "sold": table["sold"],
+                "capacity": table["capacity"],
+                "prices": {code: str(price) for code, price in table["prices"].items()},
+            }
+        )
+
 
 class OrderViewSet(
+    MetricsViewSetMixin,
+    ReplicaReadMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -202,26 +283,51 @@ class OrderViewSet(
     permission_classes = [IsAdminAllowDeleteOrIsAuthenticatedReadAndCreateOnly]
     filter_backends = [OrderingFilter]
     ordering_fields = ["created_at"]
+    ordering = ["-created_at"]
+    pagination_class = DefaultPagination
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user).prefetch_related(
+        if self.action == "archived":
+            return ArchivedOrder.objects.filter(user=self.request.user)
+
+        queryset = Order.objects.filter(user=self.request.user)
+
+        if self.action == "list":
+            first_ticket = Ticket.objects.filter(order=OuterRef("pk")).order_by(
+                "flight__departure_time"
+            )
+            return queryset.annotate(
+                ticket_count=Count("tickets"),
+                total_price=Sum("tickets__price"),
+                first_departure=Min("tickets__flight__departure_time"),
+                first_source=Subquery(
+                    first_ticket.values("flight__route__source__name")[:1]
+                ),
+                first_destination=Subquery(
+                    first_ticket.values("flight__route__destination__name")[:1]
+                ),
+            )
+
+        if self.action != "retrieve":
+            return queryset
+
+        # prefetching the forward FK shares one Flight instance between all
+        # tickets of the order that are booked on it
+        return queryset.prefetch_related(
+            Prefetch("tickets", queryset=Ticket.objects.select_related("fare_class")),
             Prefetch(
-                "tickets",
-                queryset=Ticket.objects.select_related("flight").prefetch_related(
+                "tickets__flight",
+                queryset=Flight.objects.select_related(
+                    "route__source__closest_big_city__country",
+                    "route__destination__closest_big_city__country",
+                    "airplane__airplane_type",
+                ).prefetch_related(
                     Prefetch(
-                        "flight__route",
-                        queryset=Route.objects.select_related(
-                            "source__closest_big_city__country",
-                            "destination__closest_big_city__country",
-                        ),
-                    ),
-                    "flight__airplane__airplane_type",
-                    Prefetch(
-                        "flight__flight_crew",
+                        "flight_crew",
                         queryset=FlightCrew.objects.select_related("crew_member"),
-                    ),
+                    )
                 ),
-            )
+            ),
         )
 
     def get_serializer_class(self):
@@ -229,4 +335,28 @@ class OrderViewSet(
             return OrderListSerializer
         if self.action == "retrieve":
             return OrderDetailSerializer
+        if self.action == "archived":
+            return ArchivedOrderSerializer
         return OrderSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            response = super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # the order's flights may have been moved to the archive
+            archived = get_object_or_404(
+                ArchivedOrder.objects.filter(user=request.user), pk=kwargs["pk"]
+            )
+            return Response(ArchivedOrderSerializer(archived).data)
+        # or only some of them, the archive then holds the other tickets
+        archived = ArchivedOrder.objects.filter(
+            user=request.user, pk=response.data["id"]
+        ).first()
+        if archived is not None:
+            response.data["tickets"] = archived.tickets + response.data["tickets"]
+        return response
+
+    @action(detail=False)
+    def archived(self, request):
+        """Tickets of the user's orders whose flights were archived."""
+        return self.list(request)
@@ -0,0 +1,43 @@
+from django.contrib import admin
+
+from analytics.models import (
+    AirplaneTypeDailyStats,
+    CountryPairDailyStats,
+    RollupWatermark,
+    RouteDailyStats,
+)
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ["name", "last_id", "updated_at"]
+
+
+@admin.register(RouteDailyStats)
+class RouteDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ["date", "route", "flights", "seats", "tickets_sold", "revenue"]
+
+
+@admin.register(AirplaneTypeDailyStats)
+class AirplaneTypeDailyStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        "date",
+        "airplane_type",
+        "flights",
+        "seats",
+        "tickets_sold",
+        "revenue",
+    ]
+
+
+@admin.register(CountryPairDailyStats)
+class CountryPairDailyStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        "date",
+        "source_country",
+        "destination_country",
+        "flights",
+        "seats",
+        "tickets_sold",
+        "revenue",
+    ]
@@ -0,0 +1,30 @@
+from django_filters import rest_framework as filters
+
+from analytics.models import (
+    AirplaneTypeDailyStats,
+    CountryPairDailyStats,
+    RouteDailyStats,
+)
+
+
+class DailyStatsFilter(filters.FilterSet):
+    date_from = filters.DateFilter(field_name="date", lookup_expr="gte")
+    date_to = filters.DateFilter(field_name="date", lookup_expr="lte")
+
+
+class RouteDailyStatsFilter(DailyStatsFilter):
+    class Meta:
+        model = RouteDailyStats
+        fields = ["route"]
+
+
+class AirplaneTypeDailyStatsFilter(DailyStatsFilter):
+    class Meta:
+        model = AirplaneTypeDailyStats
+        fields = ["airplane_type"]
+
+
+class CountryPairDailyStatsFilter(DailyStatsFilter):
+    class Meta:
+        model = CountryPairDailyStats
+        fields = ["source_country", "destination_country"]
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollup import rebuild, run_rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Add flights and tickets created since the last run to the daily "
+        "analytics rollups. Run it periodically, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop the rollups and recompute them from all flights and tickets.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            processed = rebuild(options["batch_size"])
+        else:
+            processed = run_rollup(options["batch_size"])
+        self.stdout.write(
+            f"Rolled up {processed['flights']} flights "
+            f"and {processed['tickets']} tickets"
+        )
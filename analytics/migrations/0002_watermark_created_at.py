@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:56
+
+from django.db import migrations, models
+
+SOURCES = {"flights": "Flight", "tickets": "Ticket"}
+
+
+def fill_last_created_at(apps, schema_editor):
+    # rows that existed before created_at all got the time of its migration,
+    # so the (created_at, id) of the last processed row resumes where last_id
+    # stopped
+    RollupWatermark = apps.get_model("analytics", "RollupWatermark")
+    for watermark in RollupWatermark.objects.filter(name__in=SOURCES):
+        model = apps.get_model("airport", SOURCES[watermark.name])
+        watermark.last_created_at = (
+            model.objects.filter(id__lte=watermark.last_id)
+            .order_by("-created_at")
+            .values_list("created_at", flat=True)
+            .first()
+        )
+        watermark.save(update_fields=["last_created_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0015_flight_ticket_created_at"),
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rollupwatermark",
+            name="last_created_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(fill_last_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+from django.db import models
+
+from airport.models import AirplaneType, Country, Route
+
+
+class RollupWatermark(models.Model):
+    """``(created_at, id)`` of the last row a rollup source has processed."""
+
+    name = models.CharField(max_length=50, unique=True)
+    last_created_at = models.DateTimeField(null=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_created_at} #{self.last_id}"
+
+
+class DailyStats(models.Model):
+    date = models.DateField()
+    flights = models.PositiveIntegerField(default=0)
+    seats = models.PositiveIntegerField(default=0)
+    tickets_sold = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+        ordering = ["date"]
+
+    @property
+    def load_factor(self):
+        return self.tickets_sold / self.seats if self.seats else None
+
+
+class RouteDailyStats(DailyStats):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+
+    class Meta(DailyStats.Meta):
+        verbose_name_plural = "route daily stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route", "date"], name="unique_route_daily_stats"
+            )
+        ]
+
+
+class AirplaneTypeDailyStats(DailyStats):
+    airplane_type = models.ForeignKey(
+        AirplaneType, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+
+    class Meta(DailyStats.Meta):
+        verbose_name_plural = "airplane type daily stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["airplane_type", "date"],
+                name="unique_airplane_type_daily_stats",
+            )
+        ]
+
+
+class CountryPairDailyStats(DailyStats):
+    source_country = models.ForeignKey(
+        Country, on_delete=models.CASCADE, related_name="departure_daily_stats"
+    )
+    destination_country = models.ForeignKey(
+        Country, on_delete=models.CASCADE, related_name="arrival_daily_stats"
+    )
+
+    class Meta(DailyStats.Meta):
+        verbose_name_plural = "country pair daily stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_country", "destination_country", "date"],
+                name="unique_country_pair_daily_stats",
+            )
+        ]
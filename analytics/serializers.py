@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from analytics.models import (
+    AirplaneTypeDailyStats,
+    CountryPairDailyStats,
+    RouteDailyStats,
+)
+
+
+STATS_FIELDS = [
+    "date",
+    "flights",
+    "seats",
+    "tickets_sold",
+    "load_factor",
+    "revenue",
+]
+
+
+class DailyStatsSerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+
+
+class RouteDailyStatsSerializer(DailyStatsSerializer):
+    class Meta:
+        model = RouteDailyStats
+        fields = ["route", *STATS_FIELDS]
+        read_only_fields = fields
+
+
+class AirplaneTypeDailyStatsSerializer(DailyStatsSerializer):
+    airplane_type = serializers.SlugRelatedField(slug_field="name", read_only=True)
+
+    class Meta:
+        model = AirplaneTypeDailyStats
+        fields = ["airplane_type", *STATS_FIELDS]
+        read_only_fields = fields
+
+
+class CountryPairDailyStatsSerializer(DailyStatsSerializer):
+    source_country = serializers.SlugRelatedField(slug_field="name", read_only=True)
+    destination_country = serializers.SlugRelatedField(
+        slug_field="name", read_only=True
+    )
+
+    class Meta:
+        model = CountryPairDailyStats
+        fields = ["source_country", "destination_country", *STATS_FIELDS]
+        read_only_fields = fields
@@ -0,0 +1,61 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airport.models import Airport, City, Country, Route
+from analytics.models import RouteDailyStats
+
+User = get_user_model()
+
+
+class TestAnalyticsApi(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="p", is_staff=True
+        )
+        cls.user = User.objects.create_user(username="user", password="p")
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kyiv"
+        )
+        airport = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        cls.route = Route.objects.create(
+            source=airport, destination=airport, distance=500
+        )
+        for day in (1, 2, 3):
+            RouteDailyStats.objects.create(
+                route=cls.route,
+                date=date(2030, 5, day),
+                flights=1,
+                seats=100,
+                tickets_sold=25 * day,
+                revenue=1000 * day,
+            )
+
+    def test_route_stats(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(
+            reverse("analytics:route-stats-list"),
+            {"date_from": "2030-05-02", "route": self.route.id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        first = response.data["results"][0]
+        self.assertEqual(first["date"], "2030-05-02")
+        self.assertEqual(first["load_factor"], 0.5)
+        self.assertEqual(first["revenue"], "2000.00")
+
+    def test_other_rollups(self):
+        self.client.force_authenticate(self.admin)
+        for name in ["airplane-type-stats-list", "country-pair-stats-list"]:
+            response = self.client.get(reverse(f"analytics:{name}"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_forbidden(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("analytics:route-stats-list"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
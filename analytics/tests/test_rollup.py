@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from analytics.models import (
+    AirplaneTypeDailyStats,
+    CountryPairDailyStats,
+    RollupWatermark,
+    RouteDailyStats,
+)
+from analytics.rollup import rebuild, run_rollup
+
+User = get_user_model()
+DAY = datetime(2030, 5, 1, 10, tzinfo=timezone.utc)
+
+
+class TestRollup(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ukraine = Country.objects.create(name="Ukraine")
+        cls.poland = Country.objects.create(name="Poland")
+        kyiv = City.objects.create(
+            name="Kyiv", country=cls.ukraine, is_capital=True, timezone="Europe/Kyiv"
+        )
+        warsaw = City.objects.create(
+            name="Warsaw", country=cls.poland, is_capital=True, timezone="Europe/Warsaw"
+        )
+        cls.route = Route.objects.create(
+            source=Airport.objects.create(name="Boryspil", closest_big_city=kyiv),
+            destination=Airport.objects.create(name="Chopin", closest_big_city=warsaw),
+            distance=700,
+        )
+        cls.airplane_type = AirplaneType.objects.create(name="Boeing 737")
+        cls.airplane = Airplane.objects.create(
+            name="Boeing 737-800",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=cls.airplane_type,
+        )
+        cls.order = Order.objects.create(
+            user=User.objects.create_user(username="user", password="p")
+        )
+
+    def create_flight(self, departure=DAY):
+        return Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure.replace(hour=departure.hour + 2),
+        )
+
+    def sell(self, flight, seats, price="100.00"):
+        for seat in seats:
+            Ticket.objects.create(
+                row=1, seat=seat, flight=flight, order=self.order, price=Decimal(price)
+            )
+
+    def test_rollup_tables(self):
+        flight = self.create_flight()
+        self.sell(flight, [1, 2, 3])
+        self.create_flight(DAY.replace(day=2))
+
+        self.assertEqual(run_rollup(), {"flights": 2, "tickets": 3})
+
+        stats = RouteDailyStats.objects.get(route=self.route, date=DAY.date())
+        self.assertEqual(
+            (stats.flights, stats.seats, stats.tickets_sold, stats.revenue),
+            (1, 60, 3, Decimal("300.00")),
+        )
+        self.assertEqual(stats.load_factor, 0.05)
+        self.assertEqual(
+            AirplaneTypeDailyStats.objects.get(
+                airplane_type=self.airplane_type, date=DAY.date()
+            ).tickets_sold,
+            3,
+        )
+        pair = CountryPairDailyStats.objects.get(
+            source_country=self.ukraine,
+            destination_country=self.poland,
+            date=DAY.date(),
+        )
+        self.assertEqual(pair.seats, 60)
+        self.assertEqual(RouteDailyStats.objects.count(), 2)
+
+    def test_only_new_rows_processed(self):
+        flight = self.create_flight()
+        self.sell(flight, [1])
+        run_rollup()
+        self.sell(flight, [2, 3], price="50.00")
+
+        self.assertEqual(run_rollup(), {"flights": 0, "tickets": 2})
+        stats = RouteDailyStats.objects.get()
+        self.assertEqual((stats.flights, stats.tickets_sold), (1, 3))
+        self.assertEqual(stats.revenue, Decimal("200.00"))
+        self.assertEqual(
+            RollupWatermark.objects.get(name="tickets").last_id,
+            Ticket.objects.latest("id").id,
+        )
+
+    @override_settings(ROLLUP_LAG_SECONDS=60)
+    def test_rows_wait_for_the_lag(self):
+        flight = self.create_flight()
+        Flight.objects.update(
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=2)
+        )
+        self.sell(flight, [1, 2])
+        # seat 2 committed first, seat 1 belongs to a transaction still open
+        Ticket.objects.filter(seat=2).update(
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=2)
+        )
+
+        self.assertEqual(run_rollup(), {"flights": 1, "tickets": 1})
+        Ticket.objects.filter(seat=1).update(
+            created_at=datetime.now(timezone.utc) - timedelta(seconds=90)
+        )
+        self.assertEqual(run_rollup(), {"flights": 0, "tickets": 1})
+        self.assertEqual(RouteDailyStats.objects.get().tickets_sold, 2)
+
+    def test_batches(self):
+        flight = self.create_flight()
+        self.sell(flight, range(1, 6))
+        self.assertEqual(run_rollup(batch_size=2), {"flights": 1, "tickets": 5})
+        self.assertEqual(RouteDailyStats.objects.get().tickets_sold, 5)
+
+    def test_rebuild(self):
+        flight = self.create_flight()
+        self.sell(flight, [1, 2])
+        run_rollup()
+        Ticket.objects.filter(seat=2).delete()
+        rebuild()
+        self.assertEqual(RouteDailyStats.objects.get().tickets_sold, 1)
+
+    def test_command(self):
+        self.sell(self.create_flight(), [1])
+        out = StringIO()
+        call_command("rollup_analytics", stdout=out)
+        self.assertIn("Rolled up 1 flights and 1 tickets", out.getvalue())
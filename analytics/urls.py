@@ -0,0 +1,24 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from analytics.views import (
+    AirplaneTypeDailyStatsViewSet,
+    CountryPairDailyStatsViewSet,
+    RouteDailyStatsViewSet,
+)
+
+app_name = "analytics"
+
+router = DefaultRouter()
+
+router.register("routes", RouteDailyStatsViewSet, basename="route-stats")
+router.register(
+    "airplane_types", AirplaneTypeDailyStatsViewSet, basename="airplane-type-stats"
+)
+router.register(
+    "country_pairs", CountryPairDailyStatsViewSet, basename="country-pair-stats"
+)
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
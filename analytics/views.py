@@ -0,0 +1,48 @@
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.permissions import IsAdminUser
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from analytics.filters import (
+    AirplaneTypeDailyStatsFilter,
+    CountryPairDailyStatsFilter,
+    RouteDailyStatsFilter,
+)
+from analytics.models import (
+    AirplaneTypeDailyStats,
+    CountryPairDailyStats,
+    RouteDailyStats,
+)
+from analytics.serializers import (
+    AirplaneTypeDailyStatsSerializer,
+    CountryPairDailyStatsSerializer,
+    RouteDailyStatsSerializer,
+)
+from base.db_routers import ReplicaReadMixin
+from base.metrics import MetricsViewSetMixin
+from base.pagination import DefaultPagination
+
+
+class DailyStatsViewSet(MetricsViewSetMixin, ReplicaReadMixin, ReadOnlyModelViewSet):
+    permission_classes = [IsAdminUser]
+    filter_backends = [DjangoFilterBackend]
+    pagination_class = DefaultPagination
+
+
+class RouteDailyStatsViewSet(DailyStatsViewSet):
+    queryset = RouteDailyStats.objects.all()
+    serializer_class = RouteDailyStatsSerializer
+    filterset_class = RouteDailyStatsFilter
+
+
+class AirplaneTypeDailyStatsViewSet(DailyStatsViewSet):
+    queryset = AirplaneTypeDailyStats.objects.select_related("airplane_type")
+    serializer_class = AirplaneTypeDailyStatsSerializer
+    filterset_class = AirplaneTypeDailyStatsFilter
+
+
+class CountryPairDailyStatsViewSet(DailyStatsViewSet):
+    queryset = CountryPairDailyStats.objects.select_related(
+        "source_country", "destination_country"
+    )
+    serializer_class = CountryPairDailyStatsSerializer
+    filterset_class = CountryPairDailyStatsFilter
@@ -0,0 +1,51 @@
+"""
+Lists of bitmasks packed into bytes, e.g. one mask of flagged seats per
+airplane row. Every mask takes the same number of bytes, stored in the
+first byte, so the packed value does not depend on how many bits a row
+has. Masks missing at the end are zero.
+"""
+
+# a mask may take at most 255 bytes, as its width is stored in one byte
+MAX_BITS = 255 * 8
+
+
+def pack(masks):
+    masks = list(masks)
+    while masks and not masks[-1]:
+        masks.pop()
+    if not masks:
+        return b""
+    size = max((mask.bit_length() + 7) // 8 for mask in masks)
+    return bytes([size]) + b"".join(mask.to_bytes(size, "little") for mask in masks)
+
+
+def unpack(data, count=None):
+    """The first ``count`` masks of ``data`` (default: all stored masks)."""
+    data = bytes(data or b"")
+    if not data:
+        return [0] * (count or 0)
+    size = data[0]
+    if count is None:
+        count = (len(data) - 1) // size
+    return [
+        int.from_bytes(data[1 + index * size : 1 + (index + 1) * size], "little")
+        for index in range(count)
+    ]
+
+
+def from_positions(positions):
+    """Masks with bit ``bit - 1`` of mask ``index - 1`` set per 1-based pair."""
+    masks = []
+    for index, bit in positions:
+        masks.extend([0] * (index - len(masks)))
+        masks[index - 1] |= 1 << (bit - 1)
+    return masks
+
+
+def to_positions(masks):
+    return [
+        [index, bit + 1]
+        for index, mask in enumerate(masks, 1)
+        for bit in range(mask.bit_length())
+        if mask >> bit & 1
+    ]
@@ -0,0 +1,92 @@
+import itertools
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+
+_read_alias = ContextVar("read_alias", default=None)
+_replica_cycle = None
+
+
+def _next_replica():
+    global _replica_cycle
+    replicas = tuple(getattr(settings, "REPLICA_DATABASES", ()))
+    if not replicas:
+        return None
+    if _replica_cycle is None or _replica_cycle[0] != replicas:
+        _replica_cycle = (replicas, itertools.cycle(replicas))
+    return next(_replica_cycle[1])
+
+
+STICKY_COOKIE = "replica_sticky"
+
+
+def _sticky_seconds():
+    return getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+
+def _reads_own_writes(request):
+    """Whether the user's signed sticky cookie from a recent write is present."""
+    user = request.user
+    return user.is_authenticated and request.get_signed_cookie(
+        STICKY_COOKIE, default=None, salt=STICKY_COOKIE, max_age=_sticky_seconds()
+    ) == str(user.pk)
+
+
+class ReplicaRouter:
+    """
+    Send reads to the replica picked for the current request by
+    ``ReplicaReadMixin``; everything else, including all writes and
+    migrations, stays on ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests from one replica chosen round-robin per
+    request. A user whose own write succeeded in the last
+    ``REPLICA_STICKY_SECONDS`` keeps reading from ``default`` so they never
+    see a replica that has not caught up with it yet. The flag travels with
+    the client as a short-lived signed cookie, so it holds whichever worker
+    serves the next request.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not _reads_own_writes(request):
+            self._read_alias_token = _read_alias.set(_next_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_read_alias_token", None)
+        if token is not None:
+            _read_alias.reset(token)
+            self._read_alias_token = None
+
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            response.set_signed_cookie(
+                STICKY_COOKIE,
+                str(request.user.pk),
+                salt=STICKY_COOKIE,
+                max_age=_sticky_seconds(),
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,297 @@
+import atexit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAdminUser
+
+from base.middleware import QueryCollector
+from base.permissions import IsFromMetricsNetwork
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    type = None
+    suffix = ""
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels):
+        return json.dumps([str(labels[name]) for name in self.labelnames])
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in self._values.items()
+            }
+
+
+class Counter(Metric):
+    type = "counter"
+    suffix = "_total"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self.registry.changed()
+
+    @staticmethod
+    def merge(left, right):
+        return left + right
+
+    def samples(self, labels, value):
+        yield self.name + "_total", labels, value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets=DEFAULT_BUCKETS, **kwargs):
+        self.buckets = tuple(buckets)
+        super().__init__(*args, **kwargs)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # one slot per bucket, then sum and count
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+        self.registry.changed()
+
+    @staticmethod
+    def merge(left, right):
+        return [a + b for a, b in zip(left, right)]
+
+    def samples(self, labels, value):
+        for bound, count in zip(self.buckets, value):
+            yield self.name + "_bucket", {**labels, "le": repr(bound)}, count
+        yield self.name + "_bucket", {**labels, "le": "+Inf"}, value[-1]
+        yield self.name + "_sum", labels, value[-2]
+        yield self.name + "_count", labels, value[-1]
+
+
+class Registry:
+    """
+    Process-local metric registry. When ``METRICS_DIR`` is set every worker
+    periodically dumps its values there and the exposition merges all dumps,
+    so ``/metrics`` reports totals across workers regardless of which one
+    serves the scrape.
+    """
+
+    flush_interval = 1.0
+    dump_pattern = re.compile(r"^metrics_(\d+)\.json$")
+
+    def __init__(self):
+        self._metrics = {}
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        metric.registry = self
+        self._metrics[metric.name] = metric
+
+    @property
+    def directory(self):
+        directory = getattr(settings, "METRICS_DIR", None)
+        return Path(directory) if directory else None
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def changed(self):
+        if (
+            self.directory
+            and time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        directory = self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fp:
+            json.dump(self.snapshot(), fp)
+        os.replace(tmp_path, directory / f"metrics_{os.getpid()}.json")
+        self._last_flush = time.monotonic()
+
+    def clear(self):
+        """
+        Remove this process's dump. Runs at startup, where a dump under the
+        same pid belongs to an earlier process, and again at exit.
+        """
+        if self.directory:
+            (self.directory / f"metrics_{os.getpid()}.json").unlink(missing_ok=True)
+
+    def _dumps(self):
+        """Dumps of running processes; those of dead ones are removed."""
+        for path in self.directory.glob("metrics_*.json"):
+            match = self.dump_pattern.match(path.name)
+            if not match:
+                continue
+            if not _process_alive(int(match[1])):
+                path.unlink(missing_ok=True)
+                continue
+            yield path
+
+    def collect(self):
+        if not self.directory:
+            return self.snapshot()
+
+        self.flush()
+        merged = {}
+        for path in self._dumps():
+            try:
+                dump = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, values in dump.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged.setdefault(name, {})
+                for key, value in values.items():
+                    target[key] = (
+                        metric.merge(target[key], value) if key in target else value
+                    )
+        return merged
+
+    def exposition(self):
+        lines = []
+        collected = self.collect()
+        for name, metric in self._metrics.items():
+            family = name + metric.suffix
+            lines.append(f"# HELP {family} {metric.documentation}")
+            lines.append(f"# TYPE {family} {metric.type}")
+            for key, value in sorted(collected.get(name, {}).items()):
+                labels = dict(zip(metric.labelnames, json.loads(key)))
+                for sample, sample_labels, sample_value in metric.samples(
+                    labels, value
+                ):
+                    lines.append(
+                        f"{sample}{_format_labels(sample_labels)} {sample_value}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+REGISTRY = Registry()
+REGISTRY.clear()
+atexit.register(REGISTRY.clear)
+
+REQUEST_SECONDS = Histogram(
+    "airport_request_duration_seconds",
+    "Viewset request latency.",
+    ["viewset", "action", "method"],
+)
+DB_SECONDS = Histogram(
+    "airport_db_duration_seconds",
+    "Time spent in database queries per viewset request.",
+    ["viewset", "action"],
+)
+DB_QUERIES = Histogram(
+    "airport_db_queries",
+    "Number of database queries per viewset request.",
+    ["viewset", "action"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+SERIALIZER_SECONDS = Histogram(
+    "airport_serializer_duration_seconds",
+    "Non-database time spent rendering list/retrieve responses.",
+    ["viewset", "action"],
+)
+ORDERS_CREATED = Counter("airport_orders_created", "Orders created.")
+TICKETS_CREATED = Counter("airport_tickets_created", "Tickets created.")
+SEAT_CONFLICTS = Counter(
+    "airport_seat_conflicts", "Ticket requests rejected because the seat was taken."
+)
+
+
+class MetricsViewSetMixin:
+    def dispatch(self, request, *args, **kwargs):
+        self._db_timer = QueryCollector()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self._db_timer))
+            response = super().dispatch(request, *args, **kwargs)
+        # ``action`` is resolved inside dispatch by ``initialize_request``
+        labels = {
+            "viewset": type(self).__name__,
+            "action": getattr(self, "action", None) or "-",
+        }
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start, method=request.method, **labels
+        )
+        DB_SECONDS.observe(self._db_timer.duration, **labels)
+        DB_QUERIES.observe(self._db_timer.count, **labels)
+        return response
+
+    def _timed_render(self, handler, request, *args, **kwargs):
+        db_before = self._db_timer.duration
+        start = time.perf_counter()
+        response = handler(request, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        SERIALIZER_SECONDS.observe(
+            max(elapsed - (self._db_timer.duration - db_before), 0.0),
+            viewset=type(self).__name__,
+            action=self.action,
+        )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._timed_render(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._timed_render(super().retrieve, request, *args, **kwargs)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser | IsFromMetricsNetwork])
+@throttle_classes([])
+def metrics_view(request):
+    return HttpResponse(
+        REGISTRY.exposition(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
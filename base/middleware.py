@@ -0,0 +1,121 @@
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger("base.sql")
+
+
+class QueryCollector:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql] += 1
+
+    def repeated_shapes(self, threshold):
+        return [
+            (sql, count)
+            for sql, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count queries and DB time for a sampled share of requests, flag repeated
+    SQL shapes (N+1 signatures) and report them via ``Server-Timing`` and the
+    ``base.sql`` logger. Unsampled requests pass through untouched.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # under ASGI, stay async so async views are not run through a thread
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        with self._collecting(collector):
+            response = self.get_response(request)
+        return self._report(request, response, collector, start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        # connections are per thread and async ORM calls run on the request's
+        # thread-sensitive thread, so the wrappers are installed there
+        stack = await sync_to_async(self._collecting)(collector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._report(request, response, collector, start)
+
+    def _config(self):
+        return getattr(settings, "SQL_INSTRUMENTATION", {})
+
+    def _sampled(self):
+        sample_rate = self._config().get("SAMPLE_RATE", 0)
+        return bool(sample_rate) and random.random() < sample_rate
+
+    def _collecting(self, collector):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(collector))
+        return stack
+
+    def _report(self, request, response, collector, start):
+        total = time.perf_counter() - start
+        repeated = collector.repeated_shapes(
+            self._config().get("N_PLUS_ONE_THRESHOLD", 5)
+        )
+        response["Server-Timing"] = (
+            f'db;dur={collector.duration * 1000:.1f};desc="{collector.count} queries", '
+            f"total;dur={total * 1000:.1f}"
+        )
+        logger.log(
+            logging.WARNING if repeated else logging.INFO,
+            "%s %s queries=%d db_ms=%.1f total_ms=%.1f",
+            request.method,
+            request.path,
+            collector.count,
+            collector.duration * 1000,
+            total * 1000,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": collector.count,
+                "db_ms": round(collector.duration * 1000, 1),
+                "total_ms": round(total * 1000, 1),
+                "n_plus_one": [{"sql": sql, "count": count} for sql, count in repeated],
+            },
+        )
+        return response
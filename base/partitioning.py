@@ -0,0 +1,240 @@
+"""
+Monthly range partitioning of PostgreSQL tables.
+
+A partitioned table holds one partition per calendar month of its
+partition column plus a default partition that catches anything else, so
+inserts never fail for lack of a partition. Every function here is a no-op
+on other databases, which keep the plain table.
+"""
+
+import re
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    index = month.month - 1 + months
+    return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y_%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def _bound(month):
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def is_partitioned(connection, table):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(connection, table):
+    """Names of the partitions attached to ``table``."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname",
+            [table],
+        )
+        return [name for (name,) in cursor.fetchall()]
+
+
+def _rebuild(schema_editor, table, primary_key, partition_by=None, setup=None):
+    """
+    Recreate ``table`` with the same columns, checks and identity, copy its
+    rows over and restore its unique constraints, foreign keys and indexes
+    under their original names. ``setup(cursor)`` runs on the new, still
+    empty table.
+    """
+    qn = schema_editor.quote_name
+    old = f"{table}_old"
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old)}")
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('u', 'f') ORDER BY conname",
+            [old],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "WHERE i.indrelid = %s::regclass AND NOT EXISTS "
+            "(SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)",
+            [old],
+        )
+        indexes = [definition for (definition,) in cursor.fetchall()]
+
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS "
+            f"INCLUDING CONSTRAINTS INCLUDING IDENTITY INCLUDING STORAGE)"
+            + (f" PARTITION BY RANGE ({qn(partition_by)})" if partition_by else "")
+        )
+        if setup:
+            setup(cursor)
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")
+        # drops the old partitions, if any, along with it
+        cursor.execute(f"DROP TABLE {qn(old)}")
+        cursor.execute(
+            "SELECT relname FROM pg_class "
+            "WHERE oid = pg_get_serial_sequence(%s, %s)::regclass",
+            [table, primary_key[0]],
+        )
+        (sequence,) = cursor.fetchone()
+        if sequence != f"{table}_{primary_key[0]}_seq":
+            # LIKE added a suffix because the old sequence still existed
+            cursor.execute(
+                f"ALTER SEQUENCE {qn(sequence)} "
+                f"RENAME TO {qn(f'{table}_{primary_key[0]}_seq')}"
+            )
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_pkey')} "
+            f"PRIMARY KEY ({', '.join(qn(column) for column in primary_key)})"
+        )
+        for name, definition in constraints:
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}"
+            )
+        for definition in indexes:
+            cursor.execute(
+                re.sub(
+                    rf' ON (ONLY )?(\S+\.)?"?{re.escape(old)}"? ',
+                    f" ON {qn(table)} ",
+                    definition,
+                    count=1,
+                )
+            )
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, %s), "
+            f"COALESCE(MAX({qn(primary_key[0])}), 0) + 1, false) FROM {qn(table)}",
+            [table, primary_key[0]],
+        )
+
+
+def partition_table(schema_editor, table, column, primary_key="id", months_ahead=3):
+    """
+    Turn ``table`` into a table partitioned by month of ``column``, with
+    partitions for the months already in use up to ``months_ahead`` months
+    from now. The primary key becomes ``(primary_key, column)``, as
+    PostgreSQL requires the partition column in every unique constraint.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql" or is_partitioned(connection, table):
+        return
+    qn = schema_editor.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN({qn(column)}), MAX({qn(column)}) FROM {qn(table)}")
+        low, high = cursor.fetchone()
+    this_month = month_start(timezone.now())
+    first = month_start(low) if low else this_month
+    last = add_months(
+        max(month_start(high) if high else first, this_month), months_ahead
+    )
+
+    def setup(cursor):
+        cursor.execute(
+            f"CREATE TABLE {qn(default_partition_name(table))} "
+            f"PARTITION OF {qn(table)} DEFAULT"
+        )
+        month = first
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {qn(partition_name(table, month))} "
+                f"PARTITION OF {qn(table)} FOR VALUES "
+                f"FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+            )
+            month = add_months(month, 1)
+
+    _rebuild(schema_editor, table, [primary_key, column], column, setup)
+
+
+def unpartition_table(schema_editor, table, primary_key="id"):
+    """Merge the attached partitions of ``table`` back into a plain table."""
+    if is_partitioned(schema_editor.connection, table):
+        _rebuild(schema_editor, table, [primary_key])
+
+
+def create_partitions(connection, table, column, months_ahead, start=None):
+    """
+    Create the missing monthly partitions from the month of ``start``
+    (default: now) up to ``months_ahead`` months later. Rows that already
+    landed in the default partition for one of those months are moved into
+    the new partition. Returns the names of the created partitions.
+    """
+    if not is_partitioned(connection, table):
+        return []
+    qn = connection.ops.quote_name
+    default = default_partition_name(table)
+    existing = set(partitions(connection, table))
+    created = []
+    month = month_start(start or timezone.now())
+    for _ in range(months_ahead + 1):
+        name = partition_name(table, month)
+        low, high = _bound(month), _bound(add_months(month, 1))
+        month = add_months(month, 1)
+        if name in existing:
+            continue
+        rows_in_range = f"{qn(column)} >= {low} AND {qn(column)} < {high}"
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM {qn(default)} WHERE {rows_in_range} LIMIT 1")
+            misplaced = cursor.fetchone() is not None
+            if misplaced:
+                cursor.execute(
+                    f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(default)}"
+                )
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} "
+                f"FOR VALUES FROM ({low}) TO ({high})"
+            )
+            if misplaced:
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {qn(default)} WHERE {rows_in_range} "
+                    f"RETURNING *) INSERT INTO {qn(table)} SELECT * FROM moved"
+                )
+                cursor.execute(
+                    f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(default)} DEFAULT"
+                )
+        created.append(name)
+    return created
+
+
+def detach_partitions(connection, table, before):
+    """
+    Detach the monthly partitions that end on or before the month of
+    ``before``. They stay behind as standalone tables, ready to be archived
+    or dropped. Returns their names.
+    """
+    if not is_partitioned(connection, table):
+        return []
+    qn = connection.ops.quote_name
+    pattern = re.compile(rf"^{re.escape(table)}_(\d{{4}})_(\d{{2}})$")
+    detached = []
+    with connection.cursor() as cursor:
+        for name in partitions(connection, table):
+            match = pattern.match(name)
+            if not match:
+                continue
+            month = date(int(match[1]), int(match[2]), 1)
+            if add_months(month, 1) <= month_start(before):
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+                detached.append(name)
+    return detached
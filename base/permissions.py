@@ -1,3 +1,6 @@
+import ipaddress
+
+from django.conf import settings
 from rest_framework import permissions
 
 
@@ -18,3 +21,17 @@ class IsAdminAllowDeleteOrIsAuthenticatedReadAndCreateOnly(permissions.BasePermi
                 *permissions.SAFE_METHODS,
             ]
         )
+
+
+class IsFromMetricsNetwork(permissions.BasePermission):
+    """Lets scrapers in ``METRICS_ALLOWED_NETWORKS`` in without credentials."""
+
+    def has_permission(self, request, view):
+        try:
+            address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+        except ValueError:
+            return False
+        return any(
+            address in ipaddress.ip_network(network)
+            for network in settings.METRICS_ALLOWED_NETWORKS
+        )
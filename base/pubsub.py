@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.module_loading import import_string
+
+
+RESET = "reset"
+
+
+class Subscription:
+    """
+    Messages for a set of channels, queued on the event loop that
+    subscribed. A consumer that falls ``maxsize`` messages behind gets its
+    backlog replaced by a single ``RESET`` and is expected to resync.
+    """
+
+    def __init__(self, broker, channels, maxsize):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, channel, message):
+        try:
+            self.queue.put_nowait((channel, message))
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((None, RESET))
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Fan-out to the subscribers of this process only, so every stream sees
+    the writes made by the same process. Backends for several workers
+    implement the same ``subscribe``/``unsubscribe``/``publish`` methods.
+    """
+
+    def __init__(self, queue_size=1000):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, *channels):
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                # publishers run in any thread, the queue belongs to its loop
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, channel, message
+                )
+            except RuntimeError:
+                # the subscriber's loop is closed
+                self.unsubscribe(subscription)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    config = settings.PUBSUB
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def _reset_broker(setting, **kwargs):
+    if setting == "PUBSUB":
+        get_broker.cache_clear()
+
+
+def publish_on_commit(channel, message):
+    transaction.on_commit(lambda: get_broker().publish(channel, message))
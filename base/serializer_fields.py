@@ -1,17 +1,117 @@
-from rest_framework.serializers import ChoiceField
+from datetime import tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from rest_framework.fields import flatten_choices_dict, get_attribute, to_choices_dict
+from rest_framework.serializers import (
+    ChoiceField,
+    DateTimeField,
+    IntegerField,
+    ListField,
+)
+from rest_framework.settings import ISO_8601, api_settings
 from timezone_field.backends import get_tz_backend
 
+from base import bitmasks
+
+
+@lru_cache(maxsize=None)
+def get_timezone_choices(use_pytz=None):
+    """
+    Sorted timezone names of a backend together with the lookups
+    ``ChoiceField`` derives from them, built once per process and shared by
+    every field instance. Callers must treat the result as read-only.
+    """
+    tz_backend = get_tz_backend(use_pytz)
+    choices = tuple(sorted(str(tz_backend.to_tzobj(v)) for v in tz_backend.base_tzstrs))
+    grouped_choices = to_choices_dict(choices)
+    return (
+        grouped_choices,
+        flatten_choices_dict(grouped_choices),
+        {choice: choice for choice in choices},
+    )
+
+
+# CitySerializer's backend, so no request ever pays for building it
+get_timezone_choices(False)
+
 
 class TimeZoneSerializerChoicesField(ChoiceField):
     def __init__(self, choices=None, **kwargs):
         self.use_pytz = kwargs.pop("use_pytz", None)
         self.tz_backend = get_tz_backend(self.use_pytz)
 
-        if choices is None:
-            self.choices = sorted(
-                [str(self.tz_backend.to_tzobj(v)) for v in self.tz_backend.base_tzstrs]
-            )
-        else:
-            self.choices = choices
+        super().__init__(choices, **kwargs)
+
+    def _set_choices(self, choices):
+        if choices is not None:
+            return super()._set_choices(choices)
+
+        (
+            self.grouped_choices,
+            self._choices,
+            self.choice_strings_to_values,
+        ) = get_timezone_choices(self.use_pytz)
+
+    choices = property(ChoiceField._get_choices, _set_choices)
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    return ZoneInfo(name)
+
+
+class LocalDateTimeField(DateTimeField):
+    """
+    Read-only datetime rendered in the timezone found at ``timezone_source``,
+    a dotted path on the same instance, e.g.
+    ``route.source.closest_big_city.timezone``. Zones given by name are
+    memoized, so rendering many rows reuses one tzinfo per zone.
+    """
+
+    def __init__(self, timezone_source, **kwargs):
+        self.timezone_attrs = timezone_source.split(".")
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return (
+            super().get_attribute(instance),
+            get_attribute(instance, self.timezone_attrs),
+        )
+
+    def to_representation(self, value):
+        value, zone = value
+        if value is None or zone is None:
+            return super().to_representation(value)
+        if not isinstance(zone, tzinfo):
+            zone = get_zone(str(zone))
+
+        value = value.astimezone(zone)
+        output_format = getattr(self, "format", api_settings.DATETIME_FORMAT)
+        if output_format is None:
+            return value
+        if output_format.lower() == ISO_8601:
+            return value.isoformat()
+        return value.strftime(output_format)
+
+
+class BitmaskPositionsField(ListField):
+    """
+    Masks packed by ``base.bitmasks`` exposed as a list of their set bits,
+    1-based ``[index, bit]`` pairs such as ``[row, seat]``.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["child"] = ListField(
+            child=IntegerField(min_value=1, max_value=bitmasks.MAX_BITS),
+            min_length=2,
+            max_length=2,
+        )
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        return bitmasks.pack(bitmasks.from_positions(super().to_internal_value(data)))
 
-        super().__init__(self.choices, **kwargs)
+    def to_representation(self, value):
+        return bitmasks.to_positions(bitmasks.unpack(value))
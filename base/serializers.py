@@ -0,0 +1,61 @@
+import copy
+
+from rest_framework.relations import ManyRelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+_compiled_fields = {}
+
+
+def _clone_field(field):
+    """
+    Cheap copy of an unbound field: the instance dict is copied instead of
+    re-running ``__init__`` the way ``Field.__deepcopy__`` does. Only the
+    state a bound field owns is made per copy; validators, error messages
+    and choices stay shared, exactly as they are after a deep copy.
+    """
+    clone = copy.copy(field)
+    if isinstance(field, BaseSerializer):
+        clone._context = {}
+    if isinstance(field, ListSerializer):
+        clone.child = _clone_field(field.child)
+        # already bound with field_name="" by ListSerializer.__init__
+        clone.child.parent = clone
+    elif isinstance(field, ManyRelatedField):
+        clone.child_relation = _clone_field(field.child_relation)
+        clone.child_relation.parent = clone
+    return clone
+
+
+class CompiledFieldsMixin:
+    """
+    Run ``get_fields()`` (declared field copies plus ``ModelSerializer``'s
+    model introspection) once per serializer class and give every instance a
+    copy of that compiled field tree. Only valid for serializers whose
+    fields depend on the class alone, not on ``instance`` or ``context``.
+    """
+
+    def get_fields(self):
+        compiled = _compiled_fields.get(type(self))
+        if compiled is None:
+            compiled = _compiled_fields[type(self)] = super().get_fields()
+        return {name: _clone_field(field) for name, field in compiled.items()}
+
+
+def clear_compiled_fields():
+    _compiled_fields.clear()
+
+
+class IdentityMapSerializerMixin:
+    """
+    Serialize every instance at most once per response: repeated occurrences
+    of the same object anywhere under the root serializer reuse the first
+    representation.
+    """
+
+    def to_representation(self, instance):
+        cache = self.root.__dict__.setdefault("_identity_map", {})
+        key = (type(self), instance.pk)
+        if key not in cache:
+            cache[key] = super().to_representation(instance)
+        return cache[key]
@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from base import bitmasks
+
+
+class TestBitmasks(SimpleTestCase):
+    def test_pack_round_trip(self):
+        masks = [0b101, 0, 1 << 10]
+        data = bitmasks.pack(masks)
+        self.assertEqual(data[0], 2)
+        self.assertEqual(len(data), 1 + 2 * 3)
+        self.assertEqual(bitmasks.unpack(data), masks)
+
+    def test_trailing_and_missing_masks_are_zero(self):
+        self.assertEqual(bitmasks.pack([0, 0]), b"")
+        self.assertEqual(bitmasks.pack([1, 0, 0]), b"\x01\x01")
+        self.assertEqual(bitmasks.unpack(b"\x01\x01", 3), [1, 0, 0])
+        self.assertEqual(bitmasks.unpack(b"", 2), [0, 0])
+        self.assertEqual(bitmasks.unpack(memoryview(b"\x01\x03")), [3])
+
+    def test_positions(self):
+        masks = bitmasks.from_positions([[1, 2], [3, 1], [3, 6]])
+        self.assertEqual(masks, [0b10, 0, 0b100001])
+        self.assertEqual(bitmasks.to_positions(masks), [[1, 2], [3, 1], [3, 6]])
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Country
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=["replica"])
+class TestReplicaRouting(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username="admin", password="p", is_staff=True
+        )
+        Country.objects.create(name="Ukraine")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_countries(self):
+        with CaptureQueriesContext(
+            connections["default"]
+        ) as default, CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.get(reverse("airport:country-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(default), len(replica)
+
+    def test_safe_requests_read_from_replica(self):
+        response, default, replica = self.get_countries()
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(default, 0)
+        self.assertEqual(replica, 1)
+
+    def test_reads_stick_to_default_after_write(self):
+        response = self.client.post(reverse("airport:country-list"), {"name": "Poland"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # the flag comes with the client, not from this process's cache
+        cache.clear()
+        response, default, replica = self.get_countries()
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(default, 1)
+        self.assertEqual(replica, 0)
+
+    def test_sticky_cookie_bound_to_user(self):
+        self.client.post(reverse("airport:country-list"), {"name": "Poland"})
+        self.client.force_authenticate(
+            User.objects.create_user(username="other", password="p")
+        )
+        _, default, replica = self.get_countries()
+        self.assertEqual(default, 0)
+        self.assertEqual(replica, 1)
+
+    def test_writes_go_to_default(self):
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            self.client.post(reverse("airport:country-list"), {"name": "Poland"})
+        self.assertEqual(len(replica), 0)
+        self.assertTrue(Country.objects.filter(name="Poland").exists())
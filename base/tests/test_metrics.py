@@ -0,0 +1,150 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from airport.models import (
+    Country,
+    City,
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Flight,
+)
+from base.metrics import Counter, Histogram, Registry
+
+User = get_user_model()
+
+
+class TestMetricsRegistry(APITestCase):
+    def test_histogram_exposition(self):
+        registry = Registry()
+        histogram = Histogram(
+            "test_seconds", "Test.", ["view"], buckets=(0.1, 1), registry=registry
+        )
+        histogram.observe(0.05, view="a")
+        histogram.observe(0.5, view="a")
+        output = registry.exposition()
+        self.assertIn("# TYPE test_seconds histogram", output)
+        self.assertIn('test_seconds_bucket{view="a",le="0.1"} 1', output)
+        self.assertIn('test_seconds_bucket{view="a",le="1"} 2', output)
+        self.assertIn('test_seconds_bucket{view="a",le="+Inf"} 2', output)
+        self.assertIn('test_seconds_count{view="a"} 2', output)
+
+    def test_shared_directory_merges_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_DIR=directory):
+                worker, other = Registry(), Registry()
+                Counter("test_events", "Test.", registry=worker).inc(2)
+                Counter("test_events", "Test.", registry=other).inc(3)
+                other.flush()
+                # both registries live in this process, so file the dump
+                # under another running process
+                dump = next(iter(other.directory.glob("metrics_*.json")))
+                dump.rename(dump.with_name(f"metrics_{os.getppid()}.json"))
+                self.assertIn("test_events_total 5", worker.exposition())
+
+    def test_dumps_of_dead_processes_removed(self):
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_DIR=directory):
+                registry = Registry()
+                Counter("test_events", "Test.", registry=registry).inc(2)
+                registry.flush()
+                dead = registry.directory / f"metrics_{process.pid}.json"
+                dead.write_text('{"test_events": {"[]": 3}}')
+
+                self.assertIn("test_events_total 2", registry.exposition())
+                self.assertFalse(dead.exists())
+
+                registry.clear()
+                self.assertEqual(list(registry.directory.iterdir()), [])
+
+
+class TestMetricsApi(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+        cls.admin = User.objects.create_user(
+            username="admin", password="p", is_staff=True
+        )
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kiev"
+        )
+        airport = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        route = Route.objects.create(source=airport, destination=airport, distance=0)
+        airplane = Airplane.objects.create(
+            name="Boeing 737-800",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing 737"),
+        )
+        cls.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timezone.timedelta(hours=2),
+        )
+
+    def sample(self, body, name):
+        """Value of the unlabelled sample ``name``, 0 when not reported yet."""
+        for line in body.splitlines():
+            if line.startswith(f"{name} "):
+                return float(line.split()[1])
+        return 0
+
+    def metrics(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse("metrics"))
+        self.client.force_authenticate(self.user)
+        return response
+
+    def test_metrics_endpoint(self):
+        before = self.metrics().content.decode()
+        self.client.get(reverse("airport:flight-list"))
+        self.client.post(
+            reverse("airport:order-list"),
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json",
+        )
+        self.client.post(
+            reverse("airport:order-list"),
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json",
+        )
+        response = self.metrics()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn(
+            'airport_request_duration_seconds_count{viewset="FlightViewSet",'
+            'action="list",method="GET"}',
+            body,
+        )
+        self.assertIn('airport_serializer_duration_seconds_count{viewset="Flig', body)
+        # the registry is shared by the whole test run, so compare samples
+        for name in ("airport_orders_created_total", "airport_seat_conflicts_total"):
+            self.assertEqual(self.sample(body, name) - self.sample(before, name), 1)
+
+    def test_metrics_restricted(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"])
+    def test_metrics_allowed_network(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.1.2.3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="192.168.1.2")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,73 @@
+from asgiref.sync import SyncToAsync, iscoroutinefunction
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.urls import reverse
+
+from airport.models import Country
+from base.middleware import QueryInstrumentationMiddleware
+
+User = get_user_model()
+
+
+class TestQueryInstrumentationMiddleware(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+        Country.objects.create(name="Ukraine")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_no_header_when_sampling_off(self):
+        response = self.client.get(reverse("airport:country-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(
+        SQL_INSTRUMENTATION={"SAMPLE_RATE": 1, "N_PLUS_ONE_THRESHOLD": 5}
+    )
+    def test_server_timing_header_when_sampled(self):
+        with self.assertLogs("base.sql", level="INFO") as logs:
+            response = self.client.get(reverse("airport:country-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("1 queries", response["Server-Timing"])
+        self.assertEqual(logs.records[0].queries, 1)
+        self.assertEqual(logs.records[0].n_plus_one, [])
+
+    @override_settings(
+        SQL_INSTRUMENTATION={"SAMPLE_RATE": 1, "N_PLUS_ONE_THRESHOLD": 3}
+    )
+    def test_repeated_queries_flagged(self):
+        def get_response(request):
+            for pk in range(3):
+                Country.objects.filter(pk=pk).exists()
+            return HttpResponse()
+
+        middleware = QueryInstrumentationMiddleware(get_response)
+        with self.assertLogs("base.sql", level="WARNING") as logs:
+            middleware(RequestFactory().get("/"))
+        self.assertEqual(len(logs.records[0].n_plus_one), 1)
+        self.assertEqual(logs.records[0].n_plus_one[0]["count"], 3)
+
+    def test_async_chain_not_wrapped_in_thread(self):
+        self.assertFalse(isinstance(ASGIHandler()._middleware_chain, SyncToAsync))
+
+    @override_settings(
+        SQL_INSTRUMENTATION={"SAMPLE_RATE": 1, "N_PLUS_ONE_THRESHOLD": 5}
+    )
+    async def test_async_request_sampled(self):
+        async def get_response(request):
+            await Country.objects.acount()
+            return HttpResponse()
+
+        middleware = QueryInstrumentationMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        with self.assertLogs("base.sql", level="INFO") as logs:
+            response = await middleware(AsyncRequestFactory().get("/"))
+        self.assertIn("1 queries", response["Server-Timing"])
+        self.assertEqual(logs.records[0].queries, 1)
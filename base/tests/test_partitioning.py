@@ -0,0 +1,97 @@
+from datetime import date, datetime, timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from base.partitioning import (
+    add_months,
+    create_partitions,
+    is_partitioned,
+    partition_name,
+    partitions,
+)
+
+
+class TestMonths(SimpleTestCase):
+    def test_add_months(self):
+        self.assertEqual(add_months(date(2025, 11, 1), 1), date(2025, 12, 1))
+        self.assertEqual(add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+
+    def test_partition_name(self):
+        self.assertEqual(
+            partition_name("airport_ticket", date(2025, 3, 1)),
+            "airport_ticket_2025_03",
+        )
+
+
+class TestTicketPartitions(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(
+            name="Kyiv", country=country, is_capital=True, timezone="Europe/Kyiv"
+        )
+        airport = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        cls.flight = Flight.objects.create(
+            route=Route.objects.create(
+                source=airport, destination=airport, distance=500
+            ),
+            airplane=Airplane.objects.create(
+                name="Boeing 737-800",
+                rows=10,
+                seats_in_row=6,
+                airplane_type=AirplaneType.objects.create(name="Boeing 737"),
+            ),
+            departure_time=datetime(2040, 5, 3, 10, tzinfo=timezone.utc),
+            arrival_time=datetime(2040, 5, 3, 12, tzinfo=timezone.utc),
+        )
+        cls.order = Order.objects.create(
+            user=get_user_model().objects.create_user(username="user", password="p")
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite keeps the plain table")
+    def test_command_skips_plain_tables(self):
+        self.assertFalse(is_partitioned(connection, "airport_ticket"))
+        out = StringIO()
+        call_command("create_partitions", stdout=out)
+        self.assertIn("airport_ticket is not partitioned", out.getvalue())
+
+    @skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")
+    def test_create_partitions_moves_default_rows(self):
+        self.assertTrue(is_partitioned(connection, "airport_ticket"))
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        created = create_partitions(
+            connection,
+            "airport_ticket",
+            "departure_time",
+            0,
+            start=self.flight.departure_time,
+        )
+        self.assertEqual(created, ["airport_ticket_2040_05"])
+        self.assertIn(
+            "airport_ticket_2040_05", partitions(connection, "airport_ticket")
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM airport_ticket WHERE id = %s",
+                [ticket.id],
+            )
+            self.assertEqual(cursor.fetchone()[0], "airport_ticket_2040_05")
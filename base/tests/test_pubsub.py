@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from base.pubsub import RESET, InProcessBroker, get_broker
+
+
+class TestInProcessBroker(SimpleTestCase):
+    async def test_publish_to_channel_subscribers(self):
+        broker = InProcessBroker()
+        first = broker.subscribe("a")
+        second = broker.subscribe("a", "b")
+        broker.publish("a", 1)
+        broker.publish("b", 2)
+        self.assertEqual(await first.get(1), ("a", 1))
+        self.assertEqual(await second.get(1), ("a", 1))
+        self.assertEqual(await second.get(1), ("b", 2))
+        self.assertTrue(first.queue.empty())
+
+    async def test_publish_from_other_thread(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe("a")
+        thread = threading.Thread(target=broker.publish, args=("a", "x"))
+        thread.start()
+        thread.join()
+        self.assertEqual(await subscription.get(1), ("a", "x"))
+
+    async def test_unsubscribe(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe("a")
+        subscription.close()
+        broker.publish("a", 1)
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.queue.empty())
+        self.assertEqual(dict(broker._subscribers), {})
+
+    async def test_slow_subscriber_reset(self):
+        broker = InProcessBroker(queue_size=2)
+        subscription = broker.subscribe("a")
+        for message in range(3):
+            broker.publish("a", message)
+        await asyncio.sleep(0)
+        self.assertEqual(await subscription.get(1), (None, RESET))
+        self.assertTrue(subscription.queue.empty())
+
+    @override_settings(
+        PUBSUB={"BACKEND": "base.pubsub.InProcessBroker", "OPTIONS": {"queue_size": 5}}
+    )
+    def test_backend_from_settings(self):
+        self.assertEqual(get_broker().queue_size, 5)
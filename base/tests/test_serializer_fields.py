@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+
+from base.serializer_fields import (
+    BitmaskPositionsField,
+    LocalDateTimeField,
+    TimeZoneSerializerChoicesField,
+    get_zone,
+)
+
+
+class TestTimeZoneSerializerChoicesField(SimpleTestCase):
+    def test_choices_shared_between_instances(self):
+        first = TimeZoneSerializerChoicesField(use_pytz=False)
+        second = TimeZoneSerializerChoicesField(use_pytz=False)
+        self.assertIs(first.choices, second.choices)
+        self.assertIn("Europe/Kyiv", first.choices)
+        self.assertEqual(list(first.choices), sorted(first.choices))
+
+    def test_validation(self):
+        field = TimeZoneSerializerChoicesField(use_pytz=False)
+        self.assertEqual(field.to_internal_value("Europe/Kyiv"), "Europe/Kyiv")
+        with self.assertRaises(ValidationError):
+            field.to_internal_value("Mars/Olympus")
+
+    def test_explicit_choices(self):
+        field = TimeZoneSerializerChoicesField(["UTC"], use_pytz=False)
+        self.assertEqual(list(field.choices), ["UTC"])
+
+
+class TestLocalDateTimeField(SimpleTestCase):
+    def render(self, zone, when=datetime(2025, 7, 1, 12, tzinfo=timezone.utc)):
+        field = LocalDateTimeField(source="when", timezone_source="city.timezone")
+        field.bind("when_local", None)
+        instance = SimpleNamespace(when=when, city=SimpleNamespace(timezone=zone))
+        return field.to_representation(field.get_attribute(instance))
+
+    def test_renders_in_zone(self):
+        self.assertEqual(
+            self.render(get_zone("Europe/Kyiv")), "2025-07-01T15:00:00+03:00"
+        )
+        self.assertEqual(self.render("America/New_York"), "2025-07-01T08:00:00-04:00")
+
+    def test_zone_names_memoized(self):
+        self.assertIs(get_zone("Europe/Kyiv"), get_zone("Europe/Kyiv"))
+
+    def test_missing_value(self):
+        self.assertIsNone(self.render("Europe/Kyiv", when=None))
+
+
+class TestBitmaskPositionsField(SimpleTestCase):
+    def test_round_trip(self):
+        field = BitmaskPositionsField()
+        data = field.to_internal_value([[2, 1], [1, 3]])
+        self.assertEqual(data, b"\x01\x04\x01")
+        self.assertEqual(field.to_representation(data), [[1, 3], [2, 1]])
+        self.assertEqual(field.to_representation(b""), [])
+
+    def test_validation(self):
+        field = BitmaskPositionsField()
+        for value in ([[1]], [[0, 1]], [[1, 2, 3]], [[1, 10000]]):
+            with self.assertRaises(ValidationError):
+                field.to_internal_value(value)
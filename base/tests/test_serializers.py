@@ -0,0 +1,38 @@
+from django.test import SimpleTestCase
+
+from airport.serializers import FlightDetailSerializer, OrderDetailSerializer
+
+
+class TestCompiledFieldsMixin(SimpleTestCase):
+    def test_instances_get_own_bound_fields(self):
+        first, second = FlightDetailSerializer(), FlightDetailSerializer()
+        for name in ["route", "tickets", "flight_crew"]:
+            self.assertIsNot(first.fields[name], second.fields[name])
+            self.assertIs(first.fields[name].root, first)
+            self.assertIs(second.fields[name].root, second)
+
+    def test_list_child_bound_to_own_root(self):
+        first, second = OrderDetailSerializer(), OrderDetailSerializer()
+        first_flight = first.fields["tickets"].child.fields["flight"]
+        second_flight = second.fields["tickets"].child.fields["flight"]
+        self.assertIsNot(first_flight, second_flight)
+        self.assertIs(first_flight.root, first)
+        self.assertIs(second_flight.root, second)
+
+    def test_field_tree_matches_declaration(self):
+        serializer = FlightDetailSerializer()
+        self.assertEqual(
+            list(serializer.fields),
+            [
+                "id",
+                "route",
+                "airplane",
+                "flight_crew",
+                "departure_time",
+                "arrival_time",
+                "departure_local",
+                "arrival_local",
+                "tickets",
+            ],
+        )
+        self.assertTrue(serializer.fields["route"].read_only)
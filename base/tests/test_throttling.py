@@ -0,0 +1,54 @@
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from base.throttling import SQLiteCounterStore, get_counter_store
+
+User = get_user_model()
+
+
+class TestSQLiteCounterStore(APITestCase):
+    def test_incr_shared_between_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "throttle.sqlite3"
+            first, second = SQLiteCounterStore(path), SQLiteCounterStore(path)
+            self.assertEqual(first.incr("key", 60), 1)
+            self.assertEqual(second.incr("key", 60), 2)
+            self.assertEqual(first.incr("other", 60), 1)
+
+    def test_empty_path_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            SQLiteCounterStore("")
+
+
+@override_settings(
+    THROTTLE_STORE={
+        "BACKEND": "base.throttling.SQLiteCounterStore",
+        "OPTIONS": {"path": ":memory:"},
+    }
+)
+class TestFixedWindowThrottle(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", password="p")
+
+    def test_user_throttled_after_rate(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("airport:country-list")
+        for _ in range(3):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        connection = get_counter_store().connection
+        self.assertEqual(
+            connection.execute("SELECT count FROM throttle_counter").fetchall(), [(3,)]
+        )
+        # exhaust the rest of the window (200/minute for users)
+        connection.execute("UPDATE throttle_counter SET count = 200")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
@@ -0,0 +1,123 @@
+import random
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.module_loading import import_string
+from rest_framework import throttling
+
+
+class CacheCounterStore:
+    """
+    Counters in a Django cache alias. ``add`` + ``incr`` is atomic on the
+    Redis and Memcached backends, which is what this store is meant for.
+    """
+
+    def __init__(self, alias="default"):
+        self.cache = caches[alias]
+
+    def incr(self, key, timeout):
+        if self.cache.add(key, 1, timeout):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # the key expired between add and incr
+            self.cache.add(key, 1, timeout)
+            return 1
+
+
+class SQLiteCounterStore:
+    """
+    Counters in a local SQLite file shared by every worker on the host; each
+    increment is one upsert statement, so it is atomic across processes.
+    """
+
+    cleanup_probability = 0.001
+
+    def __init__(self, path):
+        self.path = str(path)
+        if not self.path:
+            # sqlite3 would open a private temporary database per connection
+            raise ImproperlyConfigured("SQLiteCounterStore needs a file path")
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_counter "
+                "(key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def incr(self, key, timeout):
+        now = time.time()
+        if random.random() < self.cleanup_probability:
+            self.connection.execute(
+                "DELETE FROM throttle_counter WHERE expires < ?", (now,)
+            )
+        (count,) = self.connection.execute(
+            "INSERT INTO throttle_counter (key, count, expires) VALUES (?, 1, ?) "
+            "ON CONFLICT (key) DO UPDATE SET count = count + 1 RETURNING count",
+            (key, now + timeout),
+        ).fetchone()
+        return count
+
+
+@lru_cache(maxsize=None)
+def get_counter_store():
+    config = settings.THROTTLE_STORE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def _reset_counter_store(setting, **kwargs):
+    if setting == "THROTTLE_STORE":
+        get_counter_store.cache_clear()
+
+
+class FixedWindowRateThrottleMixin:
+    """
+    Fixed-window counting instead of DRF's per-key timestamp history: one
+    atomic increment in the shared counter store per check.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        count = get_counter_store().incr(f"{self.key}:{window}", self.duration)
+        if count > self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    def wait(self):
+        return max(self.window_end - self.now, 0)
+
+
+class AnonRateThrottle(FixedWindowRateThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(FixedWindowRateThrottleMixin, throttling.UserRateThrottle):
+    pass
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     "drf_spectacular",
     "accounts",
     "airport",
+    "analytics",
 ]
 
 MIDDLEWARE = [
@@ -37,6 +38,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "base.middleware.QueryInstrumentationMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -59,6 +61,12 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
+POSTGRES_POOL = os.environ.get("POSTGRES_POOL", "false").lower() in ("1", "true")
+POSTGRES_CONN_HEALTH_CHECKS = os.environ.get(
+    "POSTGRES_CONN_HEALTH_CHECKS", "true"
+).lower() in ("1", "true")
+POSTGRES_STATEMENT_TIMEOUT = int(os.environ.get("POSTGRES_STATEMENT_TIMEOUT", 0))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -67,9 +75,49 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": int(os.environ["POSTGRES_DB_PORT"]),
+        # Django refuses persistent connections when the psycopg pool is on;
+        # off by default, as ASGI requests run their sync code in per-request
+        # threads whose persistent connections are neither reused nor closed
+        "CONN_MAX_AGE": (
+            0 if POSTGRES_POOL else int(os.environ.get("POSTGRES_CONN_MAX_AGE", 0))
+        ),
+        "CONN_HEALTH_CHECKS": POSTGRES_CONN_HEALTH_CHECKS,
+        "OPTIONS": {},
     }
 }
 
+if POSTGRES_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("POSTGRES_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.environ.get("POSTGRES_POOL_MAX_SIZE", 10)),
+        "timeout": float(os.environ.get("POSTGRES_POOL_TIMEOUT", 10)),
+    }
+
+if POSTGRES_STATEMENT_TIMEOUT:
+    # milliseconds, enforced server-side for every statement
+    DATABASES["default"]["OPTIONS"][
+        "options"
+    ] = f"-c statement_timeout={POSTGRES_STATEMENT_TIMEOUT}"
+
+REPLICA_DATABASES = []
+for index, host in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    alias = f"replica_{index}"
+    host, _, port = host.strip().partition(":")
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": int(port or DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["base.db_routers.ReplicaRouter"]
+
+# seconds a user keeps reading from the primary after their own write
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -114,18 +162,30 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "base.permissions.IsAdminOrIsAuthenticatedReadOnly",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "base.throttling.AnonRateThrottle",
+        "base.throttling.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {"anon": "60/minute", "user": "200/minute"},
 }
 
+# counters shared by every worker; point the backend at
+# "base.throttling.CacheCounterStore" with a Redis/Memcached cache alias when
+# workers run on several hosts
+THROTTLE_STORE = {
+    "BACKEND": "base.throttling.SQLiteCounterStore",
+    "OPTIONS": {
+        # an empty path would give every connection its own private database
+        "path": os.environ.get("THROTTLE_SQLITE_PATH")
+        or BASE_DIR / "throttle.sqlite3"
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport API",
     "DESCRIPTION": "REST API for airport service",
@@ -133,9 +193,77 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+SQL_INSTRUMENTATION = {
+    "SAMPLE_RATE": float(os.environ.get("SQL_INSTRUMENTATION_SAMPLE_RATE", 0)),
+    "N_PLUS_ONE_THRESHOLD": int(os.environ.get("SQL_N_PLUS_ONE_THRESHOLD", 5)),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {"base.sql": {"handlers": ["console"], "level": "INFO"}},
+}
+
+METRICS_DIR = os.environ.get("METRICS_DIR")
+# networks allowed to scrape /metrics without credentials; staff always can
+METRICS_ALLOWED_NETWORKS = list(
+    filter(None, os.environ.get("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32").split(","))
+)
+
+# seconds a resolved JWT user is reused before it is loaded again
+JWT_USER_CACHE_TTL = int(os.environ.get("JWT_USER_CACHE_TTL", 60))
+
+# rebuild interval of the in-memory blacklisted-JTI filter, 0 disables it
+TOKEN_BLACKLIST_PRECHECK_SECONDS = int(
+    os.environ.get("TOKEN_BLACKLIST_PRECHECK_SECONDS", 0)
+)
+
+# flights kept per airport departures/arrivals board, and seconds a board is
+# reused when no Flight save invalidates it first
+FLIGHT_BOARD_SIZE = int(os.environ.get("FLIGHT_BOARD_SIZE", 50))
+FLIGHT_BOARD_CACHE_SECONDS = int(os.environ.get("FLIGHT_BOARD_CACHE_SECONDS", 60))
+
+# ticket pricing: (BASE_FARE + distance * PRICE_PER_KM) * fare class multiplier
+# * (1 + LOAD_FACTOR_WEIGHT * load_factor ** 2)
+# * (1 + LAST_MINUTE_WEIGHT * share of LAST_MINUTE_DAYS already elapsed)
+PRICING = {
+    "BASE_FARE": "30.00",
+    "PRICE_PER_KM": "0.08",
+    "LOAD_FACTOR_WEIGHT": "1.00",
+    "LAST_MINUTE_DAYS": 30,
+    "LAST_MINUTE_WEIGHT": "0.50",
+    "TABLE_CACHE_SECONDS": int(os.environ.get("PRICE_TABLE_CACHE_SECONDS", 300)),
+}
+
+# seconds a route's cheapest-date calendar is reused between ticket sales
+ROUTE_CALENDAR_CACHE_SECONDS = int(os.environ.get("ROUTE_CALENDAR_CACHE_SECONDS", 300))
+
+# pub/sub backend behind the server-sent event streams
+PUBSUB = {"BACKEND": "base.pubsub.InProcessBroker", "OPTIONS": {"queue_size": 1000}}
+
+# seconds between keep-alive comments on idle event streams
+SSE_HEARTBEAT_SECONDS = int(os.environ.get("SSE_HEARTBEAT_SECONDS", 15))
+
+# seconds a one-time event stream ticket stays valid
+STREAM_TICKET_SECONDS = int(os.environ.get("STREAM_TICKET_SECONDS", 30))
+
+# seconds a version of an airplane's seat layout is cached
+SEAT_LAYOUT_CACHE_SECONDS = int(os.environ.get("SEAT_LAYOUT_CACHE_SECONDS", 3600))
+
+# seconds rollup_analytics leaves new flights and tickets alone, so that rows
+# of transactions still open when it runs are picked up by a later run
+ROLLUP_LAG_SECONDS = int(os.environ.get("ROLLUP_LAG_SECONDS", 60))
+
+# where archive_flights writes departed flights, and their default minimum age
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR") or BASE_DIR / "archive"
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", 365))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=2),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "accounts.serializers.TokenBlacklistSerializer",
 }
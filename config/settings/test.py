@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     "drf_spectacular",
     "accounts",
     "airport",
+    "analytics",
 ]
 
 MIDDLEWARE = [
@@ -39,6 +40,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "base.middleware.QueryInstrumentationMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -65,9 +67,21 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    },
 }
 
+# routing is switched on per test with override_settings
+REPLICA_DATABASES = []
+
+DATABASE_ROUTERS = ["base.db_routers.ReplicaRouter"]
+
+REPLICA_STICKY_SECONDS = 5
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -112,18 +126,23 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "base.permissions.IsAdminOrIsAuthenticatedReadOnly",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "base.throttling.AnonRateThrottle",
+        "base.throttling.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {"anon": "60/minute", "user": "200/minute"},
 }
 
+THROTTLE_STORE = {
+    "BACKEND": "base.throttling.SQLiteCounterStore",
+    "OPTIONS": {"path": ":memory:"},
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport API",
     "DESCRIPTION": "REST API for airport service",
@@ -131,9 +150,62 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+SQL_INSTRUMENTATION = {"SAMPLE_RATE": 0, "N_PLUS_ONE_THRESHOLD": 5}
+
+METRICS_DIR = None
+# networks allowed to scrape /metrics without credentials; staff always can
+METRICS_ALLOWED_NETWORKS = []
+
+# seconds a resolved JWT user is reused before it is loaded again
+JWT_USER_CACHE_TTL = 60
+
+# rebuild interval of the in-memory blacklisted-JTI filter, 0 disables it
+TOKEN_BLACKLIST_PRECHECK_SECONDS = 0
+
+# flights kept per airport departures/arrivals board, and seconds a board is
+# reused when no Flight save invalidates it first
+FLIGHT_BOARD_SIZE = 50
+FLIGHT_BOARD_CACHE_SECONDS = 60
+
+# ticket pricing: (BASE_FARE + distance * PRICE_PER_KM) * fare class multiplier
+# * (1 + LOAD_FACTOR_WEIGHT * load_factor ** 2)
+# * (1 + LAST_MINUTE_WEIGHT * share of LAST_MINUTE_DAYS already elapsed)
+PRICING = {
+    "BASE_FARE": "30.00",
+    "PRICE_PER_KM": "0.08",
+    "LOAD_FACTOR_WEIGHT": "1.00",
+    "LAST_MINUTE_DAYS": 30,
+    "LAST_MINUTE_WEIGHT": "0.50",
+    "TABLE_CACHE_SECONDS": 300,
+}
+
+# seconds a route's cheapest-date calendar is reused between ticket sales
+ROUTE_CALENDAR_CACHE_SECONDS = 300
+
+# pub/sub backend behind the server-sent event streams
+PUBSUB = {"BACKEND": "base.pubsub.InProcessBroker", "OPTIONS": {"queue_size": 1000}}
+
+# seconds between keep-alive comments on idle event streams
+SSE_HEARTBEAT_SECONDS = 15
+
+# seconds a one-time event stream ticket stays valid
+STREAM_TICKET_SECONDS = 30
+
+# seconds a version of an airplane's seat layout is cached
+SEAT_LAYOUT_CACHE_SECONDS = 3600
+
+# seconds rollup_analytics leaves new flights and tickets alone
+ROLLUP_LAG_SECONDS = 0
+
+# where archive_flights writes departed flights, and their default minimum age
+ARCHIVE_DIR = BASE_DIR / "archive"
+ARCHIVE_AFTER_DAYS = 365
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=2),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "accounts.serializers.TokenBlacklistSerializer",
 }
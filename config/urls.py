@@ -7,17 +7,23 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from base.metrics import metrics_view
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     # airport
     path("api/airport/", include("airport.urls", namespace="airport")),
+    # analytics
+    path("api/analytics/", include("analytics.urls", namespace="analytics")),
     # accounts
     path("api/accounts/", include("accounts.urls", namespace="accounts")),
     # docs
     path("api/doc/", SpectacularAPIView.as_view(), name="schema"),
     path("api/doc/swagger/", SpectacularSwaggerView.as_view(), name="swagger"),
     path("api/doc/redoc/", SpectacularRedocView.as_view(), name="redoc"),
+    # monitoring
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG: